@@ -640,13 +640,15 @@ class OCRAssistantGUI:
             self.update_stats("PDFs trouvés", total_pdfs)
             self.console_text.insert(tk.END, f"📄 {total_pdfs} PDFs détectés\n")
             
-            # Lancer le script réel
+            # Lancer le script réel (bilan final lu dans son fichier de métriques)
+            root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            metrics_file = os.path.join('logs', f"metrics_gui_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
             process = subprocess.Popen(
-                ["python", "main.py"],
+                ["python", "main.py", "--metrics-file", metrics_file],
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
                 universal_newlines=True,
-                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+                cwd=root_dir
             )
             
             processed_count = 0
@@ -674,6 +676,14 @@ class OCRAssistantGUI:
                 self.console_text.see(tk.END)
                 self.root.update()
             
+            process.wait()
+            metrics = self.load_run_metrics(os.path.join(root_dir, metrics_file))
+            if metrics:
+                processed_count = metrics.get('succeeded', processed_count)
+                error_count = metrics.get('files', 0) - processed_count
+                self.update_stats("Traités", processed_count)
+                self.update_stats("Erreurs", error_count)
+            
             self.update_stats("En cours", 0)
             self.console_text.insert(tk.END, f"\n✅ Traitement terminé - {processed_count} fichiers traités, {error_count} erreurs\n")
             
@@ -684,6 +694,14 @@ class OCRAssistantGUI:
             self.processing = False
             self.update_stats("En cours", 0)
     
+    def load_run_metrics(self, metrics_file):
+        """Métriques écrites par main.py en fin d'exécution (None si absentes)"""
+        try:
+            with open(metrics_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
     def load_results(self):
         """Charge les derniers résultats pour révision"""
         try:
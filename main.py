@@ -1,21 +1,79 @@
+import argparse
 import os
 import sys
+import time
 from functools import partial
 
 from src.controllers.config_controller import ConfigController
 from src.controllers.file_controller import FileController
 from src.controllers.ocr_controller import OCRController
+from src.controllers.pipeline_controller import PipelineController
+from src.controllers.watch_controller import WatchController
+from src.extractors.base_extractor import BaseExtractor
 from src.utils.concurrent_manager import ConcurrentManager
 from src.utils.logger import Logger
+from src.utils.run_manifest import RunManifest
+from src.utils.run_metrics import RunMetrics
+from src.utils.thread_tuner import ThreadTuner
 
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="OCR Assistant")
+    parser.add_argument('--full', action='store_true',
+                        help="Retraiter tous les fichiers, même ceux déjà présents dans le manifeste")
+    parser.add_argument('--daemon', action='store_true',
+                        help="Surveiller les dossiers de scan et traiter les nouveaux PDF dès leur arrivée")
+    parser.add_argument('--config', default='src/config/config.json',
+                        help="Fichier de configuration à utiliser (défaut: src/config/config.json)")
+    parser.add_argument('--metrics-file',
+                        help="Fichier JSON des métriques de l'exécution (défaut: section metrics de la configuration)")
+    return parser.parse_args(argv)
+
+
+def process_with_pool(files, config, output_folder, on_result=None):
+    """Traite les fichiers sur le pool de workers (threads ou processus)"""
+    concurrency = config.get('concurrency', {})
+    engine = concurrency.get('engine', 'thread')
+    max_workers = concurrency.get('max_workers')
+    # Unité de travail: 'page' (défaut) ou 'file'
+    work_unit = concurrency.get('work_unit', 'page')
+    
+    # L'apprentissage est enregistré dans le processus principal (on_result)
+    if work_unit == 'file':
+        process_pdf_with_output = partial(OCRController.process_pdf, output_folder=output_folder, record=False)
+        return ConcurrentManager.process_files(
+            files, process_pdf_with_output,
+            engine=engine, max_workers=max_workers,
+            on_result=on_result, config=config
+        )
+    
+    finalize_pdf_with_output = partial(OCRController.finalize_pdf, output_folder=output_folder, record=False)
+    return ConcurrentManager.process_pages(
+        files, OCRController.plan_pdf, OCRController.ocr_page_window,
+        finalize_pdf_with_output,
+        engine=engine, max_workers=max_workers,
+        on_result=on_result, config=config,
+        # OCR adaptatif: pages suivantes seulement si l'extraction est incomplète
+        expand=OCRController.next_pages if OCRController.is_adaptive() else None,
+        # Les pages d'une fenêtre (rasterize.window) sont OCRisées en un seul appel
+        pages_per_task=OCRController.get_window()
+    )
+
+
+def main(argv=None):
+    args = parse_args(argv)
     logger = Logger()
     logger.info("Starting OCR Assistant...")
+    start_time = time.perf_counter()
+    metrics_file = args.metrics_file
+    summary = {'status': 'failed', 'files': 0, 'succeeded': 0}
+    manifest = None
     
     try:
         # Load configuration
-        config = ConfigController.load_config()
+        config = ConfigController.load_config(args.config)
+        if metrics_file is None:
+            metrics_file = RunMetrics.get_metrics_file(config.get('metrics'))
         scan_folder = config.get('scan_folder', 'scan')
         sub_folders = config.get('sub_folders', [])
         output_folder = config.get('output_folder', 'output')
@@ -24,28 +82,94 @@ def main():
             logger.error("No sub_folders configured in config.json")
             return
         
+        # Réglages OCR (rastérisation, etc.)
+        OCRController.configure(config)
+        # Pages rastérisées laissées par une exécution interrompue
+        if config.get('rasterize', {}).get('to_files', True):
+            OCRController.purge_scratch_dir()
+        
+        # Règles d'extraction compilées au démarrage: un motif invalide arrête l'exécution
+        BaseExtractor.get_rule_set()
+        
         # Create output folder if it doesn't exist
         os.makedirs(output_folder, exist_ok=True)
         
-        # Create a partial function with the output folder
-        process_pdf_with_output = partial(OCRController.process_pdf, output_folder=output_folder)
+        # Manifeste: seuls les fichiers nouveaux ou modifiés sont traités (sauf --full)
+        file_filter = None
+        if config.get('manifest', {}).get('enabled', True):
+            manifest = RunManifest(config.get('manifest', {}).get('file', 'src/config/run_manifest.json'))
+            if not args.full:
+                file_filter = manifest.filter_pending
+        
+        def on_result(result):
+            OCRController.record_result(result)
+            if manifest:
+                manifest.record_result(result)
+        
+        folder_paths = [os.path.join(scan_folder, sub_folder) for sub_folder in sub_folders]
         
-        total_files_processed = 0
+        # Workers × threads OpenMP de Tesseract ajustés aux cœurs disponibles
+        sample_pdf = None
+        if config.get('concurrency', {}).get('autotune'):
+            sample_pdf = next(
+                (file for folder_path in folder_paths for file in FileController.explore_folder(folder_path)),
+                None
+            )
+        config = ThreadTuner.setup(config, sample_pdf)
+        
+        # Moteur d'exécution: 'thread' (défaut), 'process' ou 'pipeline'
+        concurrency = config.get('concurrency', {})
+        engine = concurrency.get('engine', 'thread')
+        
+        if args.daemon:
+            # Mode démon: pool gardé actif, arrêt propre sur Ctrl+C / SIGTERM
+            watcher = WatchController(config, folder_paths, output_folder, manifest)
+            watcher.run()
+            summary['status'] = 'stopped'
+            return
         
-        # Explore each sub-folder
-        for sub_folder in sub_folders:
-            folder_path = os.path.join(scan_folder, sub_folder)
-            logger.info(f"Processing folder: {folder_path}")
+        results = []
+        if engine == 'pipeline':
+            # La découverte des fichiers est le premier étage du pipeline
+            pipeline = PipelineController(
+                output_folder, concurrency.get('pipeline', {}),
+                file_filter=file_filter,
+                on_result=manifest.record_result if manifest else None
+            )
+            results = pipeline.run(folder_paths)
+            if manifest:
+                manifest.record_failures(pipeline.discovered, results)
+            total_files_processed = len(pipeline.discovered)
+        else:
+            # Explore each sub-folder
+            files = []
+            for folder_path in folder_paths:
+                logger.info(f"Processing folder: {folder_path}")
+                
+                folder_files = FileController.explore_folder(folder_path)
+                
+                if folder_files:
+                    files.extend(folder_files)
+                else:
+                    logger.warning(f"No PDF files found in {folder_path}")
             
-            files = FileController.explore_folder(folder_path)
+            if file_filter:
+                files = file_filter(files)
             
+            # Un seul pool pour tous les dossiers
             if files:
-                ConcurrentManager.process_files(files, process_pdf_with_output)
-                total_files_processed += len(files)
-            else:
-                logger.warning(f"No PDF files found in {folder_path}")
+                results = process_with_pool(files, config, output_folder, on_result)
+                if manifest:
+                    manifest.record_failures(files, results)
+            total_files_processed = len(files)
         
+        summary.update(
+            status='completed',
+            files=total_files_processed,
+            succeeded=sum(1 for result in results if result)
+        )
         logger.info(f"✓ Total files processed: {total_files_processed}")
+        RunMetrics.report()
         logger.info("OCR processing completed successfully")
         
     except FileNotFoundError as e:
@@ -57,6 +181,15 @@ def main():
     except Exception as e:
         logger.critical(f"Unexpected error: {e}")
         sys.exit(1)
+    finally:
+        # Enregistrements du manifeste pas encore sauvegardés (interruption comprise)
+        if manifest:
+            manifest.flush()
+        # Métriques écrites même si l'exécution a échoué ou a été interrompue
+        if metrics_file:
+            summary['elapsed'] = time.perf_counter() - start_time
+            RunMetrics.export(metrics_file, summary)
+            logger.info(f"Métriques écrites dans {metrics_file}")
 
 
 if __name__ == '__main__':
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark des extracteurs (date, numéro, fournisseur) et de la
+génération du nom de fichier sur des textes OCR de longueur variable
+Règles et configuration hiérarchique figées (scripts/benchmark_fixtures):
+les mesures ne dépendent pas de la configuration du dépôt
+Échoue (code 1) si un temps dépasse la référence enregistrée au-delà de la
+tolérance, ou si la référence est absente (la créer avec --update-baseline)
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from generate_invoice_corpus import build_document
+from src.extractors.date_extractor import DateExtractor
+from src.extractors.invoice_extractor import InvoiceExtractor
+from src.extractors.supplier_extractor import SupplierExtractor
+from src.utils.document_analyzer import DocumentAnalyzer
+
+BASELINE_FILE = os.path.join(ROOT, 'scripts', 'benchmark_extractors_baseline.json')
+
+# Règles et configuration hiérarchique copiées dans le dossier de travail
+FIXTURES_DIR = os.path.join(ROOT, 'scripts', 'benchmark_fixtures')
+FIXTURE_FILES = ['extraction_rules.json', 'hierarchical_config.json']
+
+FOLDER_NAME = 'Benchmark'
+
+# Confusions typiques de l'OCR
+OCR_CONFUSIONS = {
+    'O': '0', '0': 'O', 'l': '1', '1': 'l', 'I': 'l', 'e': 'c', 'é': 'e',
+    'è': 'e', 'S': '5', 'B': '8', ',': '.', 'm': 'rn'
+}
+
+# Appels mesurés, tels qu'effectués pour chaque document
+CASES = {
+    'date': lambda text: DateExtractor().extract(text),
+    'invoice': lambda text: InvoiceExtractor().extract(text),
+    'supplier': lambda text: SupplierExtractor(folder_name=FOLDER_NAME).extract(text),
+    'filename': lambda text: DocumentAnalyzer.generate_filename(text, 'scan.pdf', FOLDER_NAME),
+}
+
+# Écart absolu ignoré (ms): bruit de mesure sur les cas très rapides
+NOISE_FLOOR_MS = 0.05
+
+
+def add_ocr_noise(text, rng, rate=0.02):
+    """Substitutions de caractères et espaces parasites, comme en sortie d'OCR"""
+    characters = []
+    for character in text:
+        roll = rng.random()
+        if roll < rate and character in OCR_CONFUSIONS:
+            characters.append(OCR_CONFUSIONS[character])
+        elif roll < rate * 1.2 and character == ' ':
+            characters.append('  ')
+        else:
+            characters.append(character)
+    return ''.join(characters)
+
+
+def build_texts(page_counts, documents, seed=42):
+    """Textes OCR par nombre de pages: {pages: [texte, ...]}"""
+    rng = random.Random(seed)
+    texts = {}
+    for page_count in page_counts:
+        texts[page_count] = []
+        for index in range(documents):
+            document = build_document(rng, index, page_count=page_count)
+            text = '\n\n'.join('\n'.join(lines) for lines in document['pages'])
+            texts[page_count].append(add_ocr_noise(text, rng))
+    return texts
+
+
+def measure(function, texts, rounds):
+    """Temps par document (ms): meilleur passage sur tous les textes"""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for text in texts:
+            function(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best / len(texts) * 1000, 3)
+
+
+def run_benchmark(page_counts, documents, rounds, seed=42):
+    """Résultats {pages: {cas: ms par document}}"""
+    texts = build_texts(page_counts, documents, seed)
+    results = {}
+    for page_count, samples in texts.items():
+        characters = sum(len(text) for text in samples) // len(samples)
+        print(f"📄 {page_count} page(s) ({characters} caractères en moyenne)")
+        results[str(page_count)] = {}
+        for name, function in CASES.items():
+            # Premier appel hors mesure: imports et chargements paresseux
+            function(samples[0])
+            results[str(page_count)][name] = measure(function, samples, rounds)
+            print(f"  {name:<10} {results[str(page_count)][name]:>10.3f} ms")
+    return results
+
+
+def prepare_workdir(workdir):
+    """
+    Dossier de travail isolé avec les règles figées (chemins relatifs au dossier courant)
+    Journaux et fichiers créés par les extracteurs y restent, pas dans le dépôt
+    """
+    config_dir = os.path.join(workdir, 'src', 'config')
+    os.makedirs(config_dir, exist_ok=True)
+    for name in FIXTURE_FILES:
+        shutil.copy2(os.path.join(FIXTURES_DIR, name), os.path.join(config_dir, name))
+
+
+def find_regressions(results, baseline, tolerance):
+    """Liste des (pages, cas, référence, mesure) au-delà de la tolérance"""
+    regressions = []
+    for page_count, cases in results.items():
+        for name, value in cases.items():
+            reference = baseline.get(page_count, {}).get(name)
+            if reference is None:
+                continue
+            if value > reference * (1 + tolerance) and value - reference > NOISE_FLOOR_MS:
+                regressions.append((page_count, name, reference, value))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmark des extracteurs")
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 5, 20],
+                        help="Longueurs de texte mesurées, en pages (défaut: 1 5 20)")
+    parser.add_argument('--documents', type=int, default=10, help="Textes par longueur (défaut: 10)")
+    parser.add_argument('--rounds', type=int, default=5, help="Passages par mesure, le meilleur est gardé")
+    parser.add_argument('--seed', type=int, default=42, help="Graine des textes (défaut: 42)")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help="Fichier de référence")
+    parser.add_argument('--tolerance', type=float, default=0.3,
+                        help="Ralentissement accepté par rapport à la référence (défaut: 0.3 = 30%%)")
+    parser.add_argument('--update-baseline', action='store_true', help="Enregistrer les mesures comme référence")
+    parser.add_argument('--output', help="Fichier JSON des résultats")
+    args = parser.parse_args(argv)
+
+    baseline_path = os.path.abspath(args.baseline)
+    output_path = os.path.abspath(args.output) if args.output else None
+    if not args.update_baseline and not os.path.exists(baseline_path):
+        print(f"❌ Référence absente: {baseline_path} (la créer avec --update-baseline)")
+        return 1
+
+    # Les journaux de chaque extraction fausseraient la mesure
+    logging.getLogger('OCR_Assistant').setLevel(logging.WARNING)
+
+    cwd = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix='benchmark_extractors_')
+    try:
+        prepare_workdir(workdir)
+        os.chdir(workdir)
+        results = run_benchmark(args.pages, args.documents, args.rounds, args.seed)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Référence enregistrée: {baseline_path}")
+        return 0
+
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    regressions = find_regressions(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n❌ {len(regressions)} régression(s) au-delà de {args.tolerance:.0%}:")
+        for page_count, name, reference, value in regressions:
+            print(f"  {name} ({page_count} page(s)): {reference:.3f} → {value:.3f} ms")
+        return 1
+
+    print(f"\n✅ Aucune régression par rapport à {baseline_path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Benchmark du pipeline complet (main.py) sur un corpus de factures synthétiques
+Rapport JSON comparable d'un commit à l'autre: pages/s, documents/s,
+percentiles de latence par étape, pic de mémoire et exactitude de l'extraction
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:
+    # Windows: pic de mémoire non mesuré
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from generate_invoice_corpus import CORPUS_FILE, generate_corpus
+from src.utils.document_analyzer import DocumentAnalyzer
+
+# Fichiers de règles copiés dans le dossier de travail (chemins relatifs au dossier courant)
+RULE_FILES = ['extraction_rules.json', 'hierarchical_config.json', 'profiles']
+
+# Métriques comparées avec --compare: (clé, plus grand = meilleur)
+COMPARED = [
+    ('docs_per_second', True),
+    ('pages_per_second', True),
+    ('peak_rss_mb', False),
+    ('accuracy.filename', True),
+]
+
+
+def load_corpus(workdir, count, seed, max_pages, noise):
+    """Corpus du dossier de travail, régénéré si ses paramètres ont changé"""
+    corpus_path = os.path.join(workdir, CORPUS_FILE)
+    if os.path.exists(corpus_path):
+        with open(corpus_path, 'r', encoding='utf-8') as f:
+            corpus = json.load(f)
+        expected = {'count': count, 'seed': seed, 'max_pages': max_pages, 'noise': noise}
+        if all(corpus.get(key) == value for key, value in expected.items()):
+            return corpus
+        print("♻️  Corpus existant généré avec d'autres paramètres, régénération")
+        shutil.rmtree(os.path.join(workdir, 'scan', corpus.get('folder', '')), ignore_errors=True)
+    return generate_corpus(workdir, count, seed, max_pages, noise)
+
+
+def prepare_workdir(workdir, corpus, base_config, overrides):
+    """
+    Dossier de travail isolé: règles d'extraction, configuration du benchmark
+    Apprentissage, révision, cache et manifeste y sont écrits, pas dans le dépôt
+    Sorties, manifeste et cache OCR d'une exécution précédente sont effacés:
+    chaque exécution OCRise tout le corpus
+    """
+    config_dir = os.path.join(workdir, 'src', 'config')
+    os.makedirs(config_dir, exist_ok=True)
+    for name in RULE_FILES:
+        source = os.path.join(ROOT, 'src', 'config', name)
+        target = os.path.join(config_dir, name)
+        if os.path.isdir(source):
+            shutil.copytree(source, target, dirs_exist_ok=True)
+        elif os.path.exists(source):
+            shutil.copy2(source, target)
+
+    with open(base_config, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    config['scan_folder'] = 'scan'
+    config['sub_folders'] = [corpus['folder']]
+    config['output_folder'] = 'output'
+    config['manifest'] = dict(config.get('manifest', {}), enabled=True, file='run_manifest.json')
+    config['cache'] = dict(config.get('cache', {}), folder=os.path.join('cache', 'ocr'))
+    for key, value in overrides.items():
+        section, _, name = key.partition('.')
+        if name:
+            config.setdefault(section, {})[name] = value
+        else:
+            config[section] = value
+
+    shutil.rmtree(os.path.join(workdir, 'output'), ignore_errors=True)
+    shutil.rmtree(os.path.join(workdir, config['cache']['folder']), ignore_errors=True)
+    manifest_path = os.path.join(workdir, 'run_manifest.json')
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    config_path = os.path.join(config_dir, 'config.json')
+    with open(config_path, 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2, ensure_ascii=False)
+    return config_path
+
+
+def run_pipeline(workdir, config_path, metrics_path):
+    """Lance main.py dans le dossier de travail; retourne (code de sortie, durée)"""
+    env = dict(os.environ)
+    # review_results est importé depuis scripts/ par le contrôleur OCR
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT, os.path.join(ROOT, 'scripts'), env.get('PYTHONPATH')]))
+    command = [sys.executable, os.path.join(ROOT, 'main.py'), '--full',
+               '--config', config_path, '--metrics-file', metrics_path]
+
+    start = time.perf_counter()
+    completed = subprocess.run(command, cwd=workdir, env=env)
+    return completed.returncode, time.perf_counter() - start
+
+
+def get_peak_rss_mb():
+    """Pic de mémoire du plus gros processus enfant terminé (Mo)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # Octets sur macOS, kilo-octets ailleurs
+    divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+
+def expected_filename(document):
+    """Nom de fichier attendu, construit comme DocumentAnalyzer.analyze_document"""
+    supplier = DocumentAnalyzer.clean_filename_part(document['supplier'], use_camel_case=True)
+    invoice = re.sub(r'[^\w\-]', '', DocumentAnalyzer.remove_accents(document['invoice']))
+    return f"{document['date']}_{supplier}_{invoice}.pdf"
+
+
+def score_extraction(workdir, corpus):
+    """Exactitude par champ d'après les noms de sortie enregistrés dans le manifeste"""
+    manifest_path = os.path.join(workdir, 'run_manifest.json')
+    entries = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            entries = json.load(f).get('files', {})
+
+    outputs = {}
+    for entry in entries.values():
+        if entry.get('output_path'):
+            key = os.path.normpath(os.path.relpath(os.path.join(workdir, entry['path']), workdir))
+            outputs[key] = os.path.basename(entry['output_path'])
+
+    hits = {'date': 0, 'supplier': 0, 'invoice': 0, 'filename': 0}
+    failures = 0
+    for document in corpus['documents']:
+        filename = outputs.get(os.path.normpath(document['path']))
+        if filename is None:
+            failures += 1
+            continue
+
+        expected = expected_filename(document)
+        parts = os.path.splitext(filename)[0].split('_')
+        expected_parts = os.path.splitext(expected)[0].split('_')
+        hits['date'] += parts[0] == expected_parts[0]
+        hits['supplier'] += expected_parts[1] in parts[1:]
+        hits['invoice'] += '_'.join(expected_parts[2:]) in filename
+        hits['filename'] += filename == expected
+
+    count = len(corpus['documents']) or 1
+    accuracy = {field: round(value / count, 4) for field, value in hits.items()}
+    return accuracy, failures
+
+
+def build_report(corpus, metrics, elapsed, accuracy, failures, returncode, settings):
+    documents = len(corpus['documents'])
+    pages = corpus['pages']
+    stages = {}
+    for name, stats in metrics.get('timings', {}).items():
+        stages[name] = {
+            key: (round(value * 1000, 2) if key != 'count' else value)
+            for key, value in stats.items() if key != 'histogram'
+        }
+
+    return {
+        'commit': get_commit(),
+        'settings': settings,
+        'corpus': {'seed': corpus['seed'], 'documents': documents, 'pages': pages},
+        'returncode': returncode,
+        'elapsed_s': round(elapsed, 3),
+        'docs_per_second': round(documents / elapsed, 3) if elapsed else None,
+        'pages_per_second': round(pages / elapsed, 3) if elapsed else None,
+        'peak_rss_mb': get_peak_rss_mb(),
+        # Durées par étape en millisecondes
+        'stages_ms': stages,
+        'counters': metrics.get('counters', {}),
+        'accuracy': accuracy,
+        'failures': failures
+    }
+
+
+def get_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def get_value(report, key):
+    for part in key.split('.'):
+        report = (report or {}).get(part)
+    return report
+
+
+def compare_reports(previous, current):
+    """Affiche l'évolution des métriques principales par rapport à un rapport précédent"""
+    print(f"\n📊 Comparaison avec {previous.get('commit') or 'le rapport précédent'}:")
+    for key, higher_is_better in COMPARED:
+        before, after = get_value(previous, key), get_value(current, key)
+        if not before or after is None:
+            continue
+        change = (after - before) / before * 100
+        better = change >= 0 if higher_is_better else change <= 0
+        print(f"  {'✅' if better else '⚠️ '} {key}: {before} → {after} ({change:+.1f}%)")
+
+    for stage, stats in current['stages_ms'].items():
+        before = get_value(previous, f'stages_ms.{stage}.p50')
+        if before:
+            print(f"  {stage} p50: {before} → {stats['p50']} ms")
+
+
+def parse_override(value):
+    """section.clé=valeur JSON (ex: concurrency.engine="process")"""
+    key, _, raw = value.partition('=')
+    try:
+        return key, json.loads(raw)
+    except json.JSONDecodeError:
+        return key, raw
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark du pipeline OCR sur un corpus synthétique")
+    parser.add_argument('--count', type=int, default=20, help="Nombre de factures générées (défaut: 20)")
+    parser.add_argument('--seed', type=int, default=42, help="Graine du corpus (défaut: 42)")
+    parser.add_argument('--max-pages', type=int, default=3, help="Pages par facture au maximum (défaut: 3)")
+    parser.add_argument('--noise', type=float, default=1.0, help="Intensité du bruit de scan")
+    parser.add_argument('--config', default=os.path.join(ROOT, 'src', 'config', 'config.json'),
+                        help="Configuration de base (réglages de performance)")
+    parser.add_argument('--set', dest='overrides', action='append', default=[], metavar='SECTION.CLÉ=VALEUR',
+                        help="Réglage modifié pour le benchmark (JSON), répétable")
+    parser.add_argument('--workdir', help="Dossier de travail conservé (temporaire et supprimé sinon)")
+    parser.add_argument('--output', help="Fichier du rapport JSON")
+    parser.add_argument('--compare', help="Rapport JSON précédent à comparer")
+    args = parser.parse_args(argv)
+
+    overrides = dict(parse_override(value) for value in args.overrides)
+    workdir = args.workdir or tempfile.mkdtemp(prefix='ocr_benchmark_')
+    workdir = os.path.abspath(workdir)
+    os.makedirs(workdir, exist_ok=True)
+
+    try:
+        corpus = load_corpus(workdir, args.count, args.seed, args.max_pages, args.noise)
+        print(f"📄 Corpus: {len(corpus['documents'])} facture(s), {corpus['pages']} page(s)")
+
+        config_path = prepare_workdir(workdir, corpus, args.config, overrides)
+        metrics_path = os.path.join(workdir, 'metrics.json')
+        returncode, elapsed = run_pipeline(workdir, config_path, metrics_path)
+
+        metrics = {}
+        if os.path.exists(metrics_path):
+            with open(metrics_path, 'r', encoding='utf-8') as f:
+                metrics = json.load(f)
+
+        accuracy, failures = score_extraction(workdir, corpus)
+        report = build_report(corpus, metrics, elapsed, accuracy, failures, returncode, overrides)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare_reports(json.load(f), report)
+
+    return 1 if returncode else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
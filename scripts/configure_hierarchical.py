@@ -16,7 +16,11 @@ class HierarchicalConfigurator:
     
     def __init__(self):
         self.config_manager = HierarchicalConfig()
-        self.config = self.config_manager.config
+    
+    @property
+    def config(self):
+        """Configuration courante (remplacée à chaque sauvegarde)"""
+        return self.config_manager.config
     
     def run(self):
         """Lance la configuration interactive"""
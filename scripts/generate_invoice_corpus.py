@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Génère un corpus déterministe de factures françaises synthétiques
+PDF image (sans couche texte) rendus avec PIL, avec un peu de bruit de scan
+La vérité terrain (date, fournisseur, numéro) est écrite dans corpus.json
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from PIL import Image, ImageDraw, ImageFont
+
+CORPUS_FILE = 'corpus.json'
+
+# Page A4 à 150 DPI
+PAGE_SIZE = (1240, 1754)
+RESOLUTION = 150
+# Dates du PDF fixes: même graine, mêmes fichiers
+PDF_DATE = time.gmtime(1704067200)
+MARGIN = 90
+LINE_HEIGHT = 34
+
+FONT_CANDIDATES = [
+    'DejaVuSans.ttf',
+    '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+    'LiberationSans-Regular.ttf',
+    '/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf',
+    'arial.ttf',
+    'Arial.ttf',
+]
+
+MONTHS = ['janvier', 'février', 'mars', 'avril', 'mai', 'juin', 'juillet',
+          'août', 'septembre', 'octobre', 'novembre', 'décembre']
+
+SUPPLIERS = [
+    ('Plomberie Martin', 'SARL'),
+    ('Électricité Dubois', 'SAS'),
+    ('Garage Lefèvre', 'EURL'),
+    ('Imprimerie Moreau', 'SARL'),
+    ('Boulangerie Petit', 'SAS'),
+    ('Transports Girard', 'SA'),
+    ('Menuiserie Roux', 'SARL'),
+    ('Informatique Fournier', 'SAS'),
+    ('Papeterie Lambert', 'EURL'),
+    ('Chauffage Bonnet', 'SARL'),
+]
+
+CLIENTS = [
+    ('Jean Dupont', '12 rue des Lilas', '69003 Lyon'),
+    ('Marie Durand', '4 avenue Foch', '75016 Paris'),
+    ('Paul Bernard', '27 boulevard Victor Hugo', '06000 Nice'),
+]
+
+STREETS = ['rue de la République', 'avenue Jean Jaurès', 'rue du Commerce',
+           'boulevard Gambetta', 'place de la Mairie', 'rue Pasteur']
+
+CITIES = [('13001', 'Marseille'), ('31000', 'Toulouse'), ('33000', 'Bordeaux'),
+          ('44000', 'Nantes'), ('59000', 'Lille'), ('67000', 'Strasbourg')]
+
+PRODUCTS = ['Main d\'oeuvre', 'Déplacement', 'Fournitures diverses', 'Pièces détachées',
+            'Maintenance annuelle', 'Installation', 'Contrôle technique', 'Livraison',
+            'Ramettes papier A4', 'Cartouches d\'encre', 'Câble électrique', 'Robinetterie']
+
+
+def format_amount(value):
+    """Montant au format français (1 234,56)"""
+    return f"{value:,.2f}".replace(',', ' ').replace('.', ',')
+
+
+def format_date(day, style):
+    """Date au format numérique (12/03/2024) ou en toutes lettres (12 mars 2024)"""
+    if style == 'text':
+        return f"{day.day} {MONTHS[day.month - 1]} {day.year}"
+    return day.strftime('%d/%m/%Y')
+
+
+def make_invoice_number(rng, day, index):
+    """Numéro de facture sous l'une des formes courantes"""
+    style = rng.randrange(3)
+    if style == 0:
+        return f"FA-{day.year}-{index + 1:05d}"
+    if style == 1:
+        return f"F{day.year}{day.month:02d}{rng.randrange(1000, 9999)}"
+    return f"{rng.randrange(100000, 999999)}"
+
+
+def build_item_lines(rng, count):
+    """Lignes d'articles (désignation, quantité, prix) et total HT"""
+    lines = []
+    total = 0.0
+    for _ in range(count):
+        quantity = rng.randrange(1, 20)
+        price = rng.randrange(500, 50000) / 100
+        total += quantity * price
+        lines.append(f"{rng.choice(PRODUCTS):<28} {quantity:>4}   {format_amount(price):>10}   "
+                     f"{format_amount(quantity * price):>10}")
+    return lines, total
+
+
+def build_document(rng, index, max_pages=3, page_count=None):
+    """
+    Texte d'une facture (liste de lignes par page) et sa vérité terrain
+    La date attendue est au format du nom de fichier (YYYYMMDD), le fournisseur
+    sans sa forme juridique
+    page_count: nombre de pages imposé (aléatoire jusqu'à max_pages sinon)
+    """
+    name, legal_form = rng.choice(SUPPLIERS)
+    client = rng.choice(CLIENTS)
+    zip_code, city = rng.choice(CITIES)
+    day = date(2023, 1, 1) + timedelta(days=rng.randrange(730))
+    due = day + timedelta(days=30)
+    invoice = make_invoice_number(rng, day, index)
+    if page_count is None:
+        page_count = rng.randint(1, max(1, max_pages))
+
+    first_page = [
+        f"{name} {legal_form}",
+        f"{rng.randrange(1, 150)} {rng.choice(STREETS)}",
+        f"{zip_code} {city}",
+        f"SIRET : {rng.randrange(10 ** 13, 10 ** 14)}",
+        "",
+        f"{'':>40}{client[0]}",
+        f"{'':>40}{client[1]}",
+        f"{'':>40}{client[2]}",
+        "",
+        f"FACTURE N° {invoice}",
+        f"Date de facture : {format_date(day, rng.choice(['numeric', 'text']))}",
+        "",
+        f"{'Désignation':<28} {'Qté':>4}   {'PU HT':>10}   {'Total HT':>10}",
+    ]
+    items, total = build_item_lines(rng, rng.randint(3, 12))
+    first_page.extend(items)
+
+    pages = [first_page]
+    for number in range(2, page_count + 1):
+        items, subtotal = build_item_lines(rng, rng.randint(15, 35))
+        total += subtotal
+        pages.append([f"Facture {invoice} - page {number}/{page_count}", ""] + items)
+
+    pages[-1].extend([
+        "",
+        f"{'Total HT':>50} {format_amount(total):>12}",
+        f"{'TVA 20%':>50} {format_amount(total * 0.2):>12}",
+        f"{'Total TTC':>50} {format_amount(total * 1.2):>12}",
+        "",
+        f"Échéance : {format_date(due, 'numeric')}" if rng.random() < 0.5 else "Paiement à réception",
+        f"{name} - TVA intracommunautaire FR{rng.randrange(10, 99)}{rng.randrange(10 ** 8, 10 ** 9)}",
+    ])
+
+    return {
+        'name': f"facture_{index + 1:04d}.pdf",
+        'date': day.strftime('%Y%m%d'),
+        'supplier': name,
+        'invoice': invoice,
+        'pages': pages
+    }
+
+
+def load_font(size=22):
+    """Police TrueType si disponible, police intégrée de PIL sinon"""
+    for candidate in FONT_CANDIDATES:
+        try:
+            return ImageFont.truetype(candidate, size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        return ImageFont.load_default()
+
+
+def render_page(lines, rng, font, noise=1.0):
+    """Image de la page (niveaux de gris) avec bruit de scan: grain, inclinaison"""
+    image = Image.new('L', PAGE_SIZE, 255)
+    draw = ImageDraw.Draw(image)
+    for number, line in enumerate(lines):
+        y = MARGIN + number * LINE_HEIGHT
+        if y > PAGE_SIZE[1] - MARGIN:
+            break
+        draw.text((MARGIN, y), line, fill=rng.randrange(0, 60), font=font)
+
+    if noise > 0:
+        width, height = PAGE_SIZE
+        for _ in range(int(1500 * noise)):
+            draw.point((rng.randrange(width), rng.randrange(height)), fill=rng.randrange(0, 200))
+        angle = rng.uniform(-0.8, 0.8) * noise
+        image = image.rotate(angle, resample=Image.BILINEAR, fillcolor=255)
+    return image
+
+
+def write_pdf(path, images):
+    images[0].save(path, save_all=True, append_images=images[1:], resolution=RESOLUTION,
+                   creationDate=PDF_DATE, modDate=PDF_DATE)
+
+
+def generate_corpus(output_dir, count=20, seed=42, max_pages=3, noise=1.0, blank_ratio=0.1,
+                    folder='Benchmark'):
+    """
+    Écrit count factures dans output_dir/scan/<folder> et la vérité terrain
+    dans output_dir/corpus.json (même graine: même corpus)
+    Retourne la vérité terrain
+    """
+    rng = random.Random(seed)
+    font = load_font()
+    scan_folder = os.path.join(output_dir, 'scan', folder)
+    os.makedirs(scan_folder, exist_ok=True)
+
+    documents = []
+    for index in range(count):
+        document = build_document(rng, index, max_pages)
+        images = [render_page(lines, rng, font, noise) for lines in document['pages']]
+        # Verso vide d'un scan recto-verso
+        if rng.random() < blank_ratio:
+            images.append(render_page([], rng, font, noise * 0.3))
+        write_pdf(os.path.join(scan_folder, document['name']), images)
+        documents.append({
+            'path': os.path.join('scan', folder, document['name']),
+            'date': document['date'],
+            'supplier': document['supplier'],
+            'invoice': document['invoice'],
+            'pages': len(images)
+        })
+
+    corpus = {
+        # Paramètres de génération: un corpus existant n'est réutilisé que s'ils sont identiques
+        'seed': seed,
+        'count': count,
+        'max_pages': max_pages,
+        'noise': noise,
+        'blank_ratio': blank_ratio,
+        'folder': folder,
+        'documents': documents,
+        'pages': sum(document['pages'] for document in documents)
+    }
+    with open(os.path.join(output_dir, CORPUS_FILE), 'w', encoding='utf-8') as f:
+        json.dump(corpus, f, indent=2, ensure_ascii=False)
+    return corpus
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Génère un corpus de factures synthétiques")
+    parser.add_argument('output_dir', help="Dossier du corpus (scan/<dossier>/*.pdf et corpus.json)")
+    parser.add_argument('--count', type=int, default=20, help="Nombre de factures (défaut: 20)")
+    parser.add_argument('--seed', type=int, default=42, help="Graine aléatoire (défaut: 42)")
+    parser.add_argument('--max-pages', type=int, default=3, help="Pages par facture au maximum (défaut: 3)")
+    parser.add_argument('--noise', type=float, default=1.0, help="Intensité du bruit de scan, 0 pour aucun")
+    parser.add_argument('--blank-ratio', type=float, default=0.1, help="Part des factures avec un verso vide")
+    parser.add_argument('--folder', default='Benchmark', help="Sous-dossier de scan (défaut: Benchmark)")
+    args = parser.parse_args(argv)
+
+    corpus = generate_corpus(args.output_dir, args.count, args.seed, args.max_pages,
+                             args.noise, args.blank_ratio, args.folder)
+    print(f"✅ {len(corpus['documents'])} facture(s), {corpus['pages']} page(s) dans {args.output_dir}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
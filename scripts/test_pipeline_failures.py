@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test de l'isolement des erreurs OCR dans les lots du pipeline:
+une page en échec écarte son document, pas les autres PDF du même lot
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from PIL import Image
+from src.controllers.ocr_controller import OCRController
+from src.controllers.pipeline_controller import PipelineController
+from src.engines.base_engine import BaseEngine
+from src.utils.run_metrics import RunMetrics
+
+FOLDER = os.path.join('scan', 'Test')
+PAGE_COUNT = 2
+# Page dont l'OCR échoue (tesseract interrompu...)
+FAILING_PAGE = ('doc1.pdf', 2)
+
+TEXT = '''EDF Électricité de France
+Facture n° FAC-2024-001
+Date: 15/03/2024'''
+
+# Méthodes d'OCRController remplacées le temps du test (pas de PDF réel à rastériser)
+PATCHED = ['lookup_pages', 'get_page_count', 'iter_page_images', 'record_result']
+
+
+class FailingEngine(BaseEngine):
+    """Moteur factice: échoue sur FAILING_PAGE, et sur tout lot qui la contient"""
+
+    name = 'failing'
+
+    def get_version(self):
+        return 'test'
+
+    def recognize(self, page, options=None):
+        if page.info['page'] == FAILING_PAGE:
+            raise RuntimeError("tesseract interrompu")
+        return TEXT
+
+    def recognize_with_confidence(self, page, options=None):
+        return self.recognize(page, options), 90.0
+
+
+def fake_page_images(pdf_path, window=None, page_count=None):
+    """Pages rastérisées factices, marquées par (fichier, numéro)"""
+    for page_number in range(1, PAGE_COUNT + 1):
+        image = Image.new('L', (20, 20), 255)
+        image.info['page'] = (os.path.basename(pdf_path), page_number)
+        yield page_number, image
+
+
+def run_in_workdir(function):
+    """
+    Exécute function() dans un dossier de scan temporaire avec deux PDF et
+    les règles d'extraction du dépôt, moteur OCR factice
+    """
+    previous = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix='ocr_pipeline_test_')
+    try:
+        os.makedirs(os.path.join(workdir, 'src', 'config'))
+        shutil.copy(os.path.join(ROOT, 'src', 'config', 'extraction_rules.json'),
+                    os.path.join(workdir, 'src', 'config'))
+        os.makedirs(os.path.join(workdir, FOLDER))
+        for name in ('doc1.pdf', 'doc2.pdf'):
+            with open(os.path.join(workdir, FOLDER, name), 'wb') as f:
+                f.write(f"%PDF-1.4 {name}".encode())
+        os.chdir(workdir)
+        
+        OCRController.configure({'cache': {'enabled': False}, 'blank_page': {'enabled': False}})
+        OCRController._engine = FailingEngine()
+        return function()
+    finally:
+        os.chdir(previous)
+        shutil.rmtree(workdir, ignore_errors=True)
+        OCRController.close_engine()
+
+
+def test_failed_page_in_batch():
+    """Lot mêlant deux PDF: seule la page en échec n'a pas de texte"""
+    pages = [
+        (os.path.join(FOLDER, name), page_number, image)
+        for name in ('doc1.pdf', 'doc2.pdf')
+        for page_number, image in fake_page_images(name)
+    ]
+    RunMetrics.reset()
+    texts = run_in_workdir(lambda: OCRController.ocr_pages(pages))
+    
+    expected = [None if page[2].info['page'] == FAILING_PAGE else TEXT for page in pages]
+    assert texts == expected, texts
+    # La page en échec n'est pas comptée comme OCRisée
+    assert RunMetrics.get('pages_ocr') == len(pages) - 1, RunMetrics.get('pages_ocr')
+    print("✅ Lot: seule la page en échec est sans texte")
+
+
+def run_pipeline_stages(pipeline):
+    """
+    Étages du pipeline appelés dans l'ordre, les pages des deux PDF formant
+    un seul lot OCR (comme avec ocr_batch_size quand la file est pleine)
+    """
+    pages = []
+    for name in ('doc1.pdf', 'doc2.pdf'):
+        pipeline.rasterize(os.path.join(FOLDER, name), pages.append)
+    
+    ocr_pages = []
+    pipeline.ocr(pages, ocr_pages.append)
+    
+    analyses = []
+    for page in ocr_pages:
+        pipeline.analyze(page, analyses.append)
+    
+    results = []
+    for analysis in analyses:
+        pipeline.publish(analysis, results.append)
+    return results
+
+
+def test_failed_page_only_fails_its_document():
+    """Lot OCR mêlant deux PDF: doc2 est publié malgré l'échec d'une page de doc1"""
+    saved = {name: OCRController.__dict__[name] for name in PATCHED}
+    OCRController.lookup_pages = staticmethod(lambda pdf_path: None)
+    OCRController.get_page_count = staticmethod(lambda pdf_path: PAGE_COUNT)
+    OCRController.iter_page_images = staticmethod(fake_page_images)
+    OCRController.record_result = staticmethod(lambda result: None)
+    try:
+        pipeline = PipelineController('output', {'ocr_batch_size': 2 * PAGE_COUNT})
+        results = run_in_workdir(lambda: run_pipeline_stages(pipeline))
+    finally:
+        for name, value in saved.items():
+            setattr(OCRController, name, value)
+    
+    published = [os.path.basename(result['pdf_path']) for result in results]
+    assert published == ['doc2.pdf'], published
+    print("✅ Pipeline: doc2 publié, doc1 en échec")
+
+
+if __name__ == "__main__":
+    test_failed_page_in_batch()
+    test_failed_page_only_fails_its_document()
@@ -38,7 +38,14 @@ class ConfigController:
         default_config = {
             "scan_folder": "scan",
             "sub_folders": ["HN"],
-            "output_folder": "output"
+            "output_folder": "output",
+            "concurrency": {
+                "engine": "thread",
+                "max_workers": None,
+                "omp_thread_limit": None,
+                "autotune": False,
+                "work_unit": "page"
+            }
         }
         
         os.makedirs(os.path.dirname(config_path), exist_ok=True)
@@ -3,12 +3,25 @@ import os
 import json
 import platform
 import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
 from PIL import Image
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
 import pytesseract
+from src.engines.pytesseract_engine import PytesseractEngine
+from src.engines.tesserocr_engine import TesserocrEngine
+from src.extractors.base_extractor import BaseExtractor
 from src.utils.logger import Logger
+from src.utils.config_registry import ConfigRegistry
 from src.utils.document_analyzer import DocumentAnalyzer
+from src.utils.hierarchical_config import HierarchicalConfig
+from src.utils.image_preprocessor import ImagePreprocessor
 from src.utils.learning_system import LearningSystem
+from src.utils.run_metrics import RunMetrics
+from src.utils.ocr_cache import OCRCache
 
 # Configuration pour Windows
 if platform.system() == 'Windows':
@@ -30,80 +43,984 @@ class OCRController:
     logger = Logger()
     learning_system = LearningSystem()
     
+    # Réglages issus de config.json (voir configure)
+    settings = {}
+    
+    _record_lock = threading.Lock()
+    
+    # Résolution de rastérisation par défaut de pdf2image
+    DEFAULT_DPI = 200
+    # Pages rastérisées ensemble et OCRisées en un seul appel au moteur
+    DEFAULT_WINDOW = 4
+    # Langue utilisée par Tesseract quand aucune n'est précisée
+    DEFAULT_LANGUAGE = 'eng'
+    # Âge (secondes) au-delà duquel une page du dossier de travail est abandonnée
+    SCRATCH_MAX_AGE = 3600
+    
+    # Moteurs OCR disponibles, par ordre de préférence pour 'auto'
+    ENGINES = {
+        'tesserocr': TesserocrEngine,
+        'pytesseract': PytesseractEngine
+    }
+    
+    _cache = None
+    _engine = None
+    _engine_lock = threading.Lock()
+    _tesseract_version = None
+    
+    @staticmethod
+    def configure(config):
+        """Applique les réglages de config.json (à appeler aussi dans chaque worker)"""
+        OCRController.settings = dict(config or {})
+        OCRController._cache = None
+        OCRController.close_engine()
+    
+    @staticmethod
+    def get_setting(section, key, default=None):
+        """Retourne un réglage de config.json avec valeur par défaut"""
+        return (OCRController.settings.get(section) or {}).get(key, default)
+    
+    @staticmethod
+    def get_cache():
+        """Retourne le cache OCR (None si désactivé)"""
+        if not OCRController.get_setting('cache', 'enabled', True):
+            return None
+        if OCRController._cache is None:
+            OCRController._cache = OCRCache(
+                OCRController.get_setting('cache', 'folder', 'cache/ocr'),
+                OCRController.get_setting('cache', 'max_size_mb', 500)
+            )
+        return OCRController._cache
+    
+    @staticmethod
+    def get_file_hash(pdf_path):
+        """Hash du contenu du PDF (déjà calculé pour la clé du cache s'il est activé), None si illisible"""
+        cache = OCRController.get_cache()
+        try:
+            if cache is not None:
+                return cache.file_hash(pdf_path)
+            return OCRCache.hash_file(pdf_path)
+        except OSError as e:
+            OCRController.logger.warning(f"Hash impossible pour {pdf_path}: {e}")
+            return None
+    
+    @staticmethod
+    def get_engine():
+        """
+        Moteur OCR du processus (ocr_engine.backend): 'auto' (défaut) choisit
+        tesserocr, persistant, s'il est installé, sinon pytesseract
+        """
+        if OCRController._engine is not None:
+            return OCRController._engine
+        
+        with OCRController._engine_lock:
+            if OCRController._engine is None:
+                backend = OCRController.get_setting('ocr_engine', 'backend', 'auto')
+                engine_class = OCRController.ENGINES.get(backend)
+                if engine_class is None or not engine_class.is_available():
+                    if backend != 'auto':
+                        OCRController.logger.warning(f"Moteur OCR '{backend}' indisponible, utilisation de pytesseract")
+                    engine_class = next(
+                        engine for engine in OCRController.ENGINES.values() if engine.is_available()
+                    )
+                OCRController._engine = engine_class(OCRController.DEFAULT_LANGUAGE)
+                OCRController._tesseract_version = None
+                OCRController.logger.info(f"Moteur OCR: {engine_class.name}")
+        return OCRController._engine
+    
+    @staticmethod
+    def close_engine():
+        """Libère le moteur OCR (modèles chargés)"""
+        with OCRController._engine_lock:
+            if OCRController._engine is not None:
+                OCRController._engine.close()
+            OCRController._engine = None
+    
+    @staticmethod
+    def get_ocr_options(pdf_path):
+        """
+        Réglages Tesseract du dossier du PDF (ocr_settings de la config hiérarchique):
+        langue, mode de segmentation (psm), mode moteur (oem), modèle fast/best
+        Calculés une fois par version du fichier, comme la config du dossier
+        """
+        folder_name = OCRController.get_folder_name(pdf_path)
+        tessdata_dirs = OCRController.get_setting('ocr_engine', 'tessdata_dirs') or {}
+        hierarchical = HierarchicalConfig()
+        return ConfigRegistry.derive(
+            hierarchical.config_file,
+            ('ocr_options', folder_name, json.dumps(tessdata_dirs, sort_keys=True)),
+            hierarchical.config,
+            lambda: OCRController._build_ocr_options(hierarchical, folder_name, tessdata_dirs)
+        )
+    
+    @staticmethod
+    def _build_ocr_options(hierarchical, folder_name, tessdata_dirs):
+        settings = hierarchical.get_folder_config(folder_name).get('ocr_settings', {})
+        
+        # Modèle: dossier tessdata correspondant (ocr_engine.tessdata_dirs de config.json)
+        tessdata_dir = None
+        model = settings.get('model')
+        if model:
+            tessdata_dir = tessdata_dirs.get(model)
+            if not tessdata_dir:
+                OCRController.logger.warning(f"Modèle OCR '{model}' sans dossier tessdata configuré ({folder_name})")
+        
+        return {
+            'language': settings.get('language') or OCRController.DEFAULT_LANGUAGE,
+            'psm': settings.get('psm'),
+            'oem': settings.get('oem'),
+            'tessdata_dir': tessdata_dir
+        }
+    
+    @staticmethod
+    def get_ocr_signature(pdf_path):
+        """Paramètres qui influencent le texte OCR du PDF (inclus dans la clé du cache)"""
+        engine = OCRController.get_engine()
+        if OCRController._tesseract_version is None:
+            try:
+                OCRController._tesseract_version = engine.get_version()
+            except Exception as e:
+                OCRController.logger.warning(f"Version de Tesseract inconnue: {e}")
+                OCRController._tesseract_version = 'unknown'
+        
+        signature = {
+            'engine': engine.name,
+            'tesseract': OCRController._tesseract_version,
+            'dpi': OCRController.get_dpi(),
+            'ocr_options': OCRController.get_ocr_options(pdf_path)
+        }
+        # Rendu à deux résolutions: le seuil de confiance influence le texte
+        escalation = OCRController.get_escalation()
+        if escalation:
+            signature['escalation'] = escalation
+        # Le texte de la première page dépend des zones OCRisées
+        zones = BaseExtractor.preload_rules().get('ocr_zones', {})
+        if zones.get('enabled'):
+            signature['zones'] = zones
+        preprocess = OCRController.get_preprocess_settings()
+        if preprocess:
+            signature['preprocess'] = preprocess
+        if OCRController.get_setting('rasterize', 'grayscale', True):
+            signature['grayscale'] = True
+        # Pages jugées blanches: texte vide au lieu de l'OCR
+        signature['blank_page'] = OCRController.get_blank_page_settings()
+        # Le texte natif est mis en cache comme le texte OCR: le choix entre les
+        # deux dépend des seuils de la couche texte
+        text_layer = OCRController.get_text_layer_settings()
+        if text_layer:
+            signature['text_layer'] = text_layer
+        return signature
+    
+    @staticmethod
+    def get_cached_pages(pdf_path):
+        """Retourne le texte des pages déjà OCRisées pour ce contenu, ou None"""
+        cache = OCRController.get_cache()
+        if cache is None:
+            return None
+        page_texts = cache.get(pdf_path, OCRController.get_ocr_signature(pdf_path))
+        # Entrée partielle (mode adaptatif): inutilisable si toutes les pages sont attendues
+        if page_texts is not None and None in page_texts and not OCRController.is_adaptive():
+            return None
+        if page_texts is not None:
+            OCRController.logger.info(f"Texte OCR en cache pour: {pdf_path}")
+        return page_texts
+    
+    @staticmethod
+    def extract_text_layer(pdf_path):
+        """
+        Extrait la couche texte native du PDF avec pdftotext (poppler)
+        Retourne le texte de chaque page, ou None si indisponible
+        """
+        poppler_path = OCRController.get_poppler_path()
+        pdftotext = os.path.join(poppler_path, 'pdftotext') if poppler_path else 'pdftotext'
+        
+        try:
+            completed = subprocess.run(
+                [pdftotext, '-layout', '-enc', 'UTF-8', pdf_path, '-'],
+                capture_output=True, timeout=60
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            OCRController.logger.debug(f"pdftotext indisponible pour {pdf_path}: {e}")
+            return None
+        
+        if completed.returncode != 0:
+            return None
+        
+        # Les pages sont séparées par un saut de page
+        page_texts = completed.stdout.decode('utf-8', errors='replace').split('\f')
+        if page_texts and not page_texts[-1].strip():
+            page_texts.pop()
+        return page_texts
+    
+    @staticmethod
+    def get_text_layer_settings():
+        """Seuils de la couche texte native (section text_layer) ou None si désactivée"""
+        if not OCRController.get_setting('text_layer', 'enabled', True):
+            return None
+        return {
+            'min_chars_per_page': OCRController.get_setting('text_layer', 'min_chars_per_page', 50),
+            'min_alnum_ratio': OCRController.get_setting('text_layer', 'min_alnum_ratio', 0.5)
+        }
+    
+    @staticmethod
+    def is_text_layer_usable(page_texts):
+        """Vrai si la couche texte est assez riche pour remplacer l'OCR"""
+        if not page_texts:
+            return False
+        
+        settings = OCRController.get_text_layer_settings() or {}
+        min_chars = settings.get('min_chars_per_page', 50)
+        min_alnum_ratio = settings.get('min_alnum_ratio', 0.5)
+        
+        # Chaque page doit avoir du texte (sinon page scannée dans un PDF mixte)
+        for text in page_texts:
+            chars = [char for char in text if not char.isspace()]
+            if len(chars) < min_chars:
+                return False
+            
+            # Polices mal encodées: beaucoup de caractères non alphanumériques
+            alnum = sum(1 for char in chars if char.isalnum())
+            if alnum / len(chars) < min_alnum_ratio:
+                return False
+        
+        return True
+    
+    @staticmethod
+    def get_text_layer_pages(pdf_path):
+        """Retourne le texte natif des pages s'il est exploitable, sinon None"""
+        if OCRController.get_text_layer_settings() is None:
+            return None
+        
+        page_texts = OCRController.extract_text_layer(pdf_path)
+        if not OCRController.is_text_layer_usable(page_texts):
+            return None
+        
+        OCRController.logger.info(f"Couche texte native utilisée (sans OCR): {pdf_path}")
+        return page_texts
+    
+    @staticmethod
+    def lookup_pages(pdf_path):
+        """Texte des pages disponible sans OCR (cache, puis couche texte native) ou None"""
+        with RunMetrics.timer('lookup'):
+            page_texts = OCRController.get_cached_pages(pdf_path)
+            if page_texts is None:
+                page_texts = OCRController.get_text_layer_pages(pdf_path)
+        return page_texts
+    
+    @staticmethod
+    def plan_pdf(pdf_path):
+        """
+        Planifie un PDF: texte des pages s'il est disponible sans OCR,
+        sinon nombre de pages à OCRiser
+        """
+        page_texts = OCRController.lookup_pages(pdf_path)
+        if page_texts is not None:
+            return page_texts
+        return OCRController.get_page_count(pdf_path)
+    
     @staticmethod
-    def pdf_to_images(pdf_path):
+    def get_poppler_path():
+        """Retourne le chemin de poppler sur Windows (None ailleurs ou si introuvable)"""
+        # Sur Windows, spécifier le chemin de poppler si nécessaire
+        if platform.system() == 'Windows':
+            poppler_paths = [
+                r'C:\Tools\poppler\Library\bin',
+                r'C:\poppler\Library\bin',
+                r'C:\Program Files\poppler\bin',
+            ]
+            for path in poppler_paths:
+                if os.path.exists(path):
+                    return path
+        return None
+    
+    @staticmethod
+    def get_escalation():
+        """Réglages du rendu adaptatif (rasterize.escalation) ou None si désactivé"""
+        escalation = OCRController.get_setting('rasterize', 'escalation') or {}
+        if not escalation.get('enabled'):
+            return None
+        return {
+            'low_dpi': escalation.get('low_dpi', 150),
+            'high_dpi': escalation.get('high_dpi', 300),
+            'min_confidence': escalation.get('min_confidence', 60)
+        }
+    
+    @staticmethod
+    def get_dpi():
+        """Résolution du premier rendu (basse résolution si le rendu adaptatif est activé)"""
+        escalation = OCRController.get_escalation()
+        if escalation:
+            return escalation['low_dpi']
+        return OCRController.get_setting('rasterize', 'dpi', OCRController.DEFAULT_DPI)
+    
+    @staticmethod
+    def pdf_to_images(pdf_path, first_page=None, last_page=None, dpi=None):
         OCRController.logger.info(f"Converting PDF to images: {pdf_path}")
         try:
-            # Sur Windows, spécifier le chemin de poppler si nécessaire
-            if platform.system() == 'Windows':
-                poppler_paths = [
-                    r'C:\Tools\poppler\Library\bin',
-                    r'C:\poppler\Library\bin',
-                    r'C:\Program Files\poppler\bin',
-                ]
-                poppler_path = None
-                for path in poppler_paths:
-                    if os.path.exists(path):
-                        poppler_path = path
-                        break
-                
-                if poppler_path:
-                    images = convert_from_path(pdf_path, poppler_path=poppler_path)
-                else:
-                    images = convert_from_path(pdf_path)
-            else:
-                images = convert_from_path(pdf_path)
+            images = convert_from_path(
+                pdf_path,
+                dpi=dpi or OCRController.get_dpi(),
+                first_page=first_page,
+                last_page=last_page,
+                grayscale=OCRController.get_setting('rasterize', 'grayscale', True),
+                poppler_path=OCRController.get_poppler_path()
+            )
             
             OCRController.logger.debug(f"Successfully converted {len(images)} pages")
         except Exception as e:
             OCRController.logger.error(f"Error converting PDF {pdf_path}: {e}")
             images = []
         return images
+    
+    @staticmethod
+    def get_scratch_dir():
+        """
+        Dossier des pages rastérisées en attente d'OCR: rasterize.scratch_dir,
+        sinon /dev/shm (tmpfs, en mémoire) s'il existe, sinon le dossier temporaire
+        """
+        base_dir = OCRController.get_setting('rasterize', 'scratch_dir')
+        if not base_dir:
+            base_dir = '/dev/shm' if os.access('/dev/shm', os.W_OK) else tempfile.gettempdir()
+        scratch_dir = os.path.join(base_dir, 'ocr_assistant')
+        os.makedirs(scratch_dir, exist_ok=True)
+        return scratch_dir
+    
+    @staticmethod
+    def purge_scratch_dir(max_age=None):
+        """
+        Supprime les pages laissées dans le dossier de travail par une exécution
+        interrompue (arrêt brutal, plantage): fichiers plus anciens que max_age
+        secondes, pour ne pas toucher aux pages d'une autre instance en cours
+        """
+        if max_age is None:
+            max_age = OCRController.SCRATCH_MAX_AGE
+        scratch_dir = OCRController.get_scratch_dir()
+        limit = time.time() - max_age
+        removed = 0
+        for entry in os.scandir(scratch_dir):
+            try:
+                if entry.stat(follow_symlinks=False).st_mtime >= limit:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.remove(entry.path)
+                removed += 1
+            except OSError as e:
+                OCRController.logger.debug(f"Suppression impossible de {entry.path}: {e}")
+        if removed:
+            OCRController.logger.info(f"{removed} fichier(s) abandonné(s) supprimé(s) de {scratch_dir}")
+        return removed
+    
+    @staticmethod
+    def pdf_to_files(pdf_path, first_page=None, last_page=None, dpi=None):
+        """
+        Rastérise les pages en fichiers PPM/PGM (sans compression) dans le dossier de travail
+        Retourne les chemins, passés tels quels à Tesseract (aucun décodage par PIL)
+        """
+        OCRController.logger.info(f"Converting PDF to image files: {pdf_path}")
+        try:
+            paths = convert_from_path(
+                pdf_path,
+                dpi=dpi or OCRController.get_dpi(),
+                output_folder=OCRController.get_scratch_dir(),
+                output_file=uuid.uuid4().hex,
+                paths_only=True,
+                first_page=first_page,
+                last_page=last_page,
+                grayscale=OCRController.get_setting('rasterize', 'grayscale', True),
+                poppler_path=OCRController.get_poppler_path()
+            )
+            OCRController.logger.debug(f"Successfully converted {len(paths)} pages")
+        except Exception as e:
+            OCRController.logger.error(f"Error converting PDF {pdf_path}: {e}")
+            paths = []
+        return paths
+    
+    @staticmethod
+    def rasterize_pages(pdf_path, first_page=None, last_page=None, dpi=None):
+        """
+        Rastérise des pages: chemins de fichiers (rasterize.to_files, par défaut)
+        ou images PIL. Chaque page doit être libérée avec release_page
+        """
+        with RunMetrics.timer('rasterize'):
+            if OCRController.get_setting('rasterize', 'to_files', True):
+                return OCRController.pdf_to_files(pdf_path, first_page, last_page, dpi)
+            return OCRController.pdf_to_images(pdf_path, first_page, last_page, dpi)
+    
+    @staticmethod
+    def release_page(page):
+        """Libère une page rastérisée (image PIL fermée, fichier supprimé)"""
+        if isinstance(page, str):
+            try:
+                os.remove(page)
+            except OSError:
+                pass
+        else:
+            page.close()
+    
+    @staticmethod
+    def open_page(page):
+        """Image PIL d'une page (fichier ouvert seulement si nécessaire)"""
+        if isinstance(page, str):
+            image = Image.open(page)
+            image.load()
+            return image
+        return page
+    
+    @staticmethod
+    def get_window():
+        """Nombre de pages rastérisées et OCRisées ensemble (rasterize.window)"""
+        return max(1, int(OCRController.get_setting('rasterize', 'window', OCRController.DEFAULT_WINDOW)))
+    
+    @staticmethod
+    def iter_page_windows(pdf_path, window=None, page_count=None):
+        """
+        Générateur de fenêtres de pages rastérisées: liste de (numéro, page)
+        La page est un chemin de fichier ou une image PIL (voir rasterize_pages)
+        La mémoire reste bornée quel que soit le nombre de pages du PDF
+        """
+        if window is None:
+            window = OCRController.get_window()
+        window = max(1, int(window))
+        
+        if page_count is None:
+            page_count = OCRController.get_page_count(pdf_path)
+        for first_page in range(1, page_count + 1, window):
+            last_page = min(first_page + window - 1, page_count)
+            images = OCRController.rasterize_pages(pdf_path, first_page=first_page, last_page=last_page)
+            yield [(first_page + offset, image) for offset, image in enumerate(images)]
+    
+    @staticmethod
+    def iter_page_images(pdf_path, window=None, page_count=None):
+        """Générateur de pages (numéro, page) rastérisées par fenêtre de quelques pages"""
+        for pages in OCRController.iter_page_windows(pdf_path, window, page_count):
+            while pages:
+                # Libérer chaque image dès qu'elle a été consommée
+                yield pages.pop(0)
+    
+    @staticmethod
+    def get_page_count(pdf_path):
+        """Retourne le nombre de pages du PDF (0 si illisible)"""
+        try:
+            info = pdfinfo_from_path(pdf_path, poppler_path=OCRController.get_poppler_path())
+            return int(info.get('Pages', 0))
+        except Exception as e:
+            OCRController.logger.error(f"Error reading PDF info {pdf_path}: {e}")
+            return 0
 
     @staticmethod
-    def ocr_image(image):
+    def ocr_image(image, options=None):
+        """
+        OCR d'une image; une erreur du moteur (tesseract interrompu...) est
+        propagée: le document est en échec et retraité, pas enregistré sans texte
+        """
         try:
-            text = pytesseract.image_to_string(image)
-            return text
+            return OCRController.get_engine().recognize(image, options)
         except Exception as e:
             OCRController.logger.error(f"Error during OCR: {e}")
+            raise
+    
+    @staticmethod
+    def get_ocr_zones(pdf_path):
+        """
+        Zones d'en-tête et de pied de page à OCRiser pour ce PDF (section ocr_zones
+        de extraction_rules.json, surchargée par profil), ou None si désactivé
+        Chaque zone est (haut, bas) en fraction de la hauteur de la page
+        """
+        rules = BaseExtractor.preload_rules().get('ocr_zones', {})
+        if not rules.get('enabled'):
+            return None
+        
+        zones = dict(rules.get('default', {}))
+        profile = rules.get('profiles', {}).get(OCRController.get_folder_name(pdf_path))
+        if profile:
+            zones.update(profile)
+        return {name: bounds for name, bounds in zones.items() if bounds}
+    
+    @staticmethod
+    def ocr_zones(image, zones, options=None):
+        """
+        OCR des zones découpées (en-tête puis pied de page)
+        Retourne (texte concaténé, confiance moyenne ou None)
+        """
+        width, height = image.size
+        texts = []
+        confidences = []
+        for name, (top, bottom) in zones.items():
+            box = (0, int(top * height), width, int(bottom * height))
+            if box[3] <= box[1]:
+                continue
+            zone = image.crop(box)
+            try:
+                text, confidence = OCRController.ocr_image_with_confidence(zone, options)
+            finally:
+                zone.close()
+            texts.append(text)
+            if confidence is not None:
+                confidences.append(confidence)
+        
+        confidence = min(confidences) if confidences else None
+        return '\n'.join(text for text in texts if text), confidence
+    
+    @staticmethod
+    def ocr_image_with_confidence(image, options=None):
+        """
+        OCR avec confiance moyenne des mots (image_to_data) si le rendu adaptatif
+        est activé; sinon (texte, None) via image_to_string
+        """
+        if OCRController.get_escalation() is None:
+            return OCRController.ocr_image(image, options), None
+        
+        try:
+            return OCRController.get_engine().recognize_with_confidence(image, options)
+        except Exception as e:
+            OCRController.logger.error(f"Error during OCR: {e}")
+            raise
+    
+    @staticmethod
+    def get_preprocess_settings():
+        """Réglages du prétraitement des images (section preprocess) ou None si désactivé"""
+        settings = OCRController.settings.get('preprocess') or {}
+        if not settings.get('enabled'):
+            return None
+        return ImagePreprocessor.get_settings({key: value for key, value in settings.items() if key != 'enabled'})
+    
+    @staticmethod
+    def get_blank_page_settings():
+        """Seuils de détection des pages blanches (section blank_page) ou None si désactivée"""
+        if not OCRController.get_setting('blank_page', 'enabled', True):
+            return None
+        return {
+            'max_ink_ratio': OCRController.get_setting('blank_page', 'max_ink_ratio', 0.0005),
+            'dark_level': OCRController.get_setting('blank_page', 'dark_level', 160)
+        }
+    
+    @staticmethod
+    def is_blank_page(image):
+        """Vrai si la page est blanche (section blank_page de config.json)"""
+        settings = OCRController.get_blank_page_settings()
+        if settings is None:
+            return False
+        try:
+            return ImagePreprocessor.is_blank(image, **settings)
+        except Exception as e:
+            OCRController.logger.warning(f"Détection de page blanche impossible: {e}")
+            return False
+    
+    @staticmethod
+    def ocr_page_pass(pdf_path, page_number, image):
+        """
+        Un passage d'OCR sur une page rastérisée (prétraitée si configuré)
+        Retourne (texte, confiance ou None)
+        """
+        preprocess = OCRController.get_preprocess_settings()
+        if preprocess is None:
+            return OCRController.ocr_page_regions(pdf_path, page_number, image)
+        
+        opened = OCRController.open_page(image)
+        try:
+            prepared = ImagePreprocessor.preprocess(opened, preprocess)
+            try:
+                return OCRController.ocr_page_regions(pdf_path, page_number, prepared)
+            finally:
+                if prepared is not opened:
+                    prepared.close()
+        finally:
+            if opened is not image:
+                opened.close()
+    
+    @staticmethod
+    def ocr_page_regions(pdf_path, page_number, image):
+        """
+        La première page passe d'abord par les zones (en-tête/pied de page),
+        la page entière n'est OCRisée qu'en repli
+        Retourne (texte, confiance ou None)
+        """
+        options = OCRController.get_ocr_options(pdf_path)
+        zones = OCRController.get_ocr_zones(pdf_path) if page_number == 1 else None
+        if zones:
+            opened = OCRController.open_page(image)
+            try:
+                text, confidence = OCRController.ocr_zones(opened, zones, options)
+            finally:
+                if opened is not image:
+                    opened.close()
+            if not OCRController.needs_more_pages(pdf_path, [text]):
+                OCRController.logger.debug(f"OCR par zones suffisant pour {pdf_path}")
+                return text, confidence
+            OCRController.logger.debug(f"OCR par zones incomplet, page entière: {pdf_path}")
+        return OCRController.ocr_image_with_confidence(image, options)
+    
+    @staticmethod
+    def needs_higher_dpi(pdf_path, page_number, text, confidence):
+        """Vrai si la page doit être re-rendue en haute résolution"""
+        escalation = OCRController.get_escalation()
+        if escalation is None or escalation['high_dpi'] <= escalation['low_dpi']:
+            return False
+        if confidence is not None and confidence < escalation['min_confidence']:
+            OCRController.logger.debug(f"Confiance OCR {confidence:.0f} page {page_number} de {pdf_path}")
+            return True
+        # Première page: les extracteurs doivent y trouver les métadonnées
+        return page_number == 1 and OCRController.needs_more_pages(pdf_path, [text])
+    
+    @staticmethod
+    def ocr_page_image(pdf_path, page_number, image):
+        """
+        OCR d'une page rastérisée, re-rendue en haute résolution si la confiance
+        de Tesseract ou les scores des extracteurs sont insuffisants
+        Les pages blanches ne sont pas OCRisées
+        """
+        if OCRController.is_blank_page(image):
+            OCRController.logger.debug(f"Page {page_number} blanche ignorée: {pdf_path}")
+            RunMetrics.increment('pages_blank_skipped')
             return ""
+        
+        text = OCRController.ocr_page_content(pdf_path, page_number, image)
+        # Compté une fois l'OCR terminé: une page en échec n'est pas OCRisée
+        RunMetrics.increment('pages_ocr')
+        return text
+    
+    @staticmethod
+    def ocr_page_content(pdf_path, page_number, image):
+        """OCR d'une page non blanche (zones, prétraitement, rendu adaptatif)"""
+        with RunMetrics.timer('ocr_page'):
+            text, confidence = OCRController.ocr_page_pass(pdf_path, page_number, image)
+        if not OCRController.needs_higher_dpi(pdf_path, page_number, text, confidence):
+            return text
+        
+        RunMetrics.increment('pages_high_dpi')
+        high_dpi = OCRController.get_escalation()['high_dpi']
+        OCRController.logger.info(f"Page {page_number} de {pdf_path} re-rendue à {high_dpi} DPI")
+        images = OCRController.rasterize_pages(pdf_path, first_page=page_number, last_page=page_number, dpi=high_dpi)
+        if not images:
+            return text
+        high_image = images.pop()
+        try:
+            high_text, _ = OCRController.ocr_page_pass(pdf_path, page_number, high_image)
+        finally:
+            OCRController.release_page(high_image)
+        return high_text or text
+    
+    @staticmethod
+    def can_batch(pdf_path, page_number):
+        """Vrai si la page peut être OCRisée avec d'autres en un seul appel au moteur"""
+        if OCRController.get_escalation() is not None:
+            return False
+        return not (page_number == 1 and OCRController.get_ocr_zones(pdf_path))
+    
+    @staticmethod
+    def ocr_pages(pages):
+        """
+        OCR de plusieurs pages (pdf_path, numéro, page), d'un ou plusieurs PDF
+        Les pages sans traitement particulier partent en un seul appel au moteur
+        Retourne les textes dans l'ordre des pages, None pour une page dont l'OCR
+        a échoué: seul le PDF de cette page est en échec, pas tout le lot
+        """
+        texts = [None] * len(pages)
+        batch = []
+        for index, (pdf_path, page_number, page) in enumerate(pages):
+            if OCRController.is_blank_page(page):
+                OCRController.logger.debug(f"Page {page_number} blanche ignorée: {pdf_path}")
+                RunMetrics.increment('pages_blank_skipped')
+                texts[index] = ""
+            elif OCRController.can_batch(pdf_path, page_number):
+                batch.append(index)
+            else:
+                texts[index] = OCRController.try_ocr_page_content(pdf_path, page_number, page)
+        
+        # Un lot par jeu de réglages Tesseract (les PDF peuvent venir de dossiers différents)
+        groups = {}
+        for index in batch:
+            options = OCRController.get_ocr_options(pages[index][0])
+            groups.setdefault(json.dumps(options, sort_keys=True), (options, []))[1].append(index)
+        
+        for options, indexes in groups.values():
+            if len(indexes) == 1:
+                pdf_path, page_number, page = pages[indexes[0]]
+                texts[indexes[0]] = OCRController.try_ocr_page_content(pdf_path, page_number, page)
+                continue
+            
+            RunMetrics.increment('ocr_batches')
+            with RunMetrics.timer('ocr_batch'):
+                batch_texts = OCRController.ocr_batch([pages[index][2] for index in indexes], options)
+            RunMetrics.increment('pages_ocr', sum(text is not None for text in batch_texts))
+            for index, text in zip(indexes, batch_texts):
+                if text is None:
+                    OCRController.logger.error(f"OCR impossible page {pages[index][1]} de {pages[index][0]}")
+                texts[index] = text
+        
+        return texts
+    
+    @staticmethod
+    def try_ocr_page_content(pdf_path, page_number, image):
+        """OCR d'une page d'un lot: None en cas d'échec, sans interrompre les autres pages"""
+        try:
+            text = OCRController.ocr_page_content(pdf_path, page_number, image)
+        except Exception as e:
+            OCRController.logger.error(f"OCR impossible page {page_number} de {pdf_path}: {e}")
+            return None
+        RunMetrics.increment('pages_ocr')
+        return text
+    
+    @staticmethod
+    def ocr_batch(images, options=None):
+        """
+        OCR de plusieurs pages en un appel au moteur (prétraitées si configuré)
+        Si l'appel groupé échoue, les pages sont reprises une par une
+        Retourne le texte de chaque page, None pour une page en échec
+        """
+        preprocess = OCRController.get_preprocess_settings()
+        prepared = []
+        try:
+            for image in images:
+                if preprocess is None:
+                    prepared.append(image)
+                    continue
+                opened = OCRController.open_page(image)
+                prepared.append(ImagePreprocessor.preprocess(opened, preprocess))
+                if opened is not image:
+                    opened.close()
+            
+            try:
+                return OCRController.get_engine().recognize_batch(prepared, options)
+            except Exception as e:
+                OCRController.logger.warning(f"OCR par lot impossible, page par page: {e}")
+            
+            texts = []
+            for image in prepared:
+                try:
+                    texts.append(OCRController.ocr_image(image, options))
+                except Exception:
+                    # Erreur déjà journalisée par ocr_image
+                    texts.append(None)
+            return texts
+        finally:
+            for image, original in zip(prepared, images):
+                if image is not original:
+                    image.close()
+    
+    @staticmethod
+    def ocr_page(pdf_path, page_number):
+        """Rastérise et OCR une seule page (unité de travail du planificateur)"""
+        OCRController.logger.debug(f"Processing page {page_number} of {pdf_path}")
+        images = OCRController.rasterize_pages(pdf_path, first_page=page_number, last_page=page_number)
+        if not images:
+            return ""
+        image = images.pop()
+        try:
+            return OCRController.ocr_page_image(pdf_path, page_number, image)
+        finally:
+            OCRController.release_page(image)
 
     @staticmethod
-    def process_pdf(pdf_path, output_folder="output"):
+    def ocr_page_window(pdf_path, page_numbers):
+        """
+        Rastérise et OCR des pages d'un PDF (unité de travail du planificateur)
+        Les pages consécutives sont rendues ensemble et OCRisées en un seul appel au moteur
+        Retourne les textes dans l'ordre; une page en échec fait échouer la tâche
+        """
+        OCRController.logger.debug(f"Processing pages {page_numbers} of {pdf_path}")
+        texts = []
+        start = 0
+        while start < len(page_numbers):
+            end = start + 1
+            while end < len(page_numbers) and page_numbers[end] == page_numbers[end - 1] + 1:
+                end += 1
+            first_page = page_numbers[start]
+            images = OCRController.rasterize_pages(pdf_path, first_page=first_page, last_page=page_numbers[end - 1])
+            try:
+                window_texts = OCRController.ocr_pages(
+                    [(pdf_path, first_page + offset, image) for offset, image in enumerate(images)]
+                )
+            finally:
+                for image in images:
+                    OCRController.release_page(image)
+            if None in window_texts:
+                raise RuntimeError(f"OCR impossible sur une page de {pdf_path}")
+            # Pages non rendues: texte vide, comme ocr_page
+            texts.extend(window_texts + [''] * (end - start - len(window_texts)))
+            start = end
+        return texts
+    
+    @staticmethod
+    def is_adaptive():
+        """Vrai si l'OCR adaptatif est activé (première page d'abord)"""
+        return bool(OCRController.get_setting('adaptive', 'enabled', False))
+    
+    @staticmethod
+    def needs_more_pages(pdf_path, page_texts):
+        """Vrai si date, fournisseur ou numéro manquent ou sont sous le seuil de confiance"""
+        text = '\n'.join(text for text in page_texts if text)
+        if not text:
+            return True
+        
+        metadata = DocumentAnalyzer.extract_metadata(text, OCRController.get_folder_name(pdf_path))
+        thresholds = {
+            'date': OCRController.get_setting('adaptive', 'min_date_score', 0),
+            'supplier': OCRController.get_setting('adaptive', 'min_supplier_score', 20),
+            'invoice': 0
+        }
+        for field, threshold in thresholds.items():
+            if metadata[field] is None or metadata['scores'][field] < threshold:
+                OCRController.logger.debug(f"{field} insuffisant pour {pdf_path}, pages suivantes nécessaires")
+                return True
+        return False
+    
+    @staticmethod
+    def next_pages(pdf_path, page_results):
+        """
+        Pages à OCRiser ensuite en mode adaptatif (liste vide: document complet)
+        page_results contient le texte des pages déjà traitées, None pour les autres
+        """
+        missing = [number for number, text in enumerate(page_results, 1) if text is None]
+        if not missing:
+            return []
+        
+        # Extraction satisfaisante avec les pages déjà lues: arrêt anticipé
+        if len(missing) < len(page_results) and not OCRController.needs_more_pages(pdf_path, page_results):
+            OCRController.logger.info(f"OCR adaptatif: {len(missing)} page(s) non OCRisée(s) pour {pdf_path}")
+            return []
+        
+        step = max(1, int(OCRController.get_setting('adaptive', 'pages_per_step', 1)))
+        return missing[:step]
+    
+    @staticmethod
+    def process_pdf(pdf_path, output_folder="output", record=True):
+        """
+        Traite un PDF complet et retourne le résultat (dict) ou None
+        Si record=False, l'enregistrement (apprentissage/révision) est laissé à l'appelant
+        """
+        with RunMetrics.timer('document'):
+            return OCRController._process_pdf(pdf_path, output_folder, record)
+    
+    @staticmethod
+    def _process_pdf(pdf_path, output_folder, record):
         OCRController.logger.info(f"Starting OCR process for: {pdf_path}")
         
-        # Extraire le texte via OCR
-        images = OCRController.pdf_to_images(pdf_path)
-        if not images:
+        # Contenu déjà OCRisé ou PDF natif: aucune rastérisation nécessaire
+        page_texts = OCRController.lookup_pages(pdf_path)
+        if page_texts is not None and None not in page_texts:
+            return OCRController.finalize_pdf(pdf_path, page_texts, output_folder, record)
+        
+        if OCRController.is_adaptive():
+            return OCRController.process_pdf_adaptive(pdf_path, page_texts, output_folder, record)
+        
+        # Extraire le texte via OCR, par fenêtre de pages (mémoire bornée)
+        # Les pages d'une fenêtre sont OCRisées en un seul appel au moteur
+        page_texts = []
+        
+        for pages in OCRController.iter_page_windows(pdf_path):
+            OCRController.logger.debug(f"Processing pages {[page_number for page_number, _ in pages]}")
+            try:
+                texts = OCRController.ocr_pages(
+                    [(pdf_path, page_number, image) for page_number, image in pages]
+                )
+            finally:
+                for _, image in pages:
+                    OCRController.release_page(image)
+                del pages
+            # Page en échec: le document n'est pas enregistré sans son texte
+            if None in texts:
+                OCRController.logger.error(f"Document en échec (OCR d'une page impossible): {pdf_path}")
+                return None
+            page_texts.extend(texts)
+        
+        if not page_texts:
             OCRController.logger.warning(f"No images extracted from {pdf_path}")
             return None
-            
-        all_text = []
         
-        for i, image in enumerate(images):
-            OCRController.logger.debug(f"Processing page {i+1}/{len(images)}")
-            text = OCRController.ocr_image(image)
-            if text:
-                all_text.append(text)
+        return OCRController.finalize_pdf(pdf_path, page_texts, output_folder, record)
+    
+    @staticmethod
+    def process_pdf_adaptive(pdf_path, page_texts=None, output_folder="output", record=True):
+        """
+        OCR adaptatif: première page d'abord, pages suivantes seulement si
+        l'extraction est incomplète (page_texts: pages déjà connues, None sinon)
+        """
+        if page_texts is None:
+            page_count = OCRController.get_page_count(pdf_path)
+            if page_count == 0:
+                OCRController.logger.warning(f"No images extracted from {pdf_path}")
+                return None
+            page_texts = [None] * page_count
+        
+        page_numbers = OCRController.next_pages(pdf_path, page_texts)
+        while page_numbers:
+            for page_number in page_numbers:
+                page_texts[page_number - 1] = OCRController.ocr_page(pdf_path, page_number) or ''
+            page_numbers = OCRController.next_pages(pdf_path, page_texts)
+        
+        return OCRController.finalize_pdf(pdf_path, page_texts, output_folder, record)
+    
+    @staticmethod
+    def finalize_pdf(pdf_path, page_texts, output_folder="output", record=True):
+        """
+        Assemble le texte des pages (dans l'ordre), génère le nom et copie le PDF
+        Retourne le résultat (dict) ou None
+        """
+        analysis = OCRController.analyze_pdf(pdf_path, page_texts)
+        if analysis is None:
+            return None
+        return OCRController.publish_pdf(analysis, output_folder, record)
+    
+    @staticmethod
+    def get_folder_name(pdf_path):
+        """Retourne le sous-dossier de scan du PDF (profil fournisseur) ou None"""
+        path_parts = os.path.normpath(pdf_path).split(os.sep)
+        if 'scan' in path_parts:
+            scan_index = path_parts.index('scan')
+            if scan_index + 1 < len(path_parts):
+                return path_parts[scan_index + 1]
+        return None
+    
+    @staticmethod
+    def analyze_pdf(pdf_path, page_texts):
+        """
+        Assemble le texte des pages (dans l'ordre) et extrait les métadonnées
+        Retourne l'analyse (dict) ou None
+        """
+        all_text = [text for text in page_texts if text]
         
         if not all_text:
             OCRController.logger.warning(f"No text extracted from {pdf_path}")
             return None
         
+        # Mémoriser le texte pour les prochaines exécutions
+        cache = OCRController.get_cache()
+        if cache is not None:
+            cache.put(pdf_path, OCRController.get_ocr_signature(pdf_path), page_texts)
+        
         # Analyser le texte pour générer un nom intelligent
         full_text = '\n'.join(all_text)
         original_filename = os.path.basename(pdf_path)
+        folder_name = OCRController.get_folder_name(pdf_path)
         
-        # Extraire le nom du dossier depuis le chemin
-        folder_name = None
-        path_parts = os.path.normpath(pdf_path).split(os.sep)
-        if 'scan' in path_parts:
-            scan_index = path_parts.index('scan')
-            if scan_index + 1 < len(path_parts):
-                folder_name = path_parts[scan_index + 1]
+        with RunMetrics.timer('extract'):
+            extracted = DocumentAnalyzer.analyze_document(full_text, original_filename, folder_name)
+        new_filename = extracted['filename']
         
-        new_filename = DocumentAnalyzer.generate_filename(full_text, original_filename, folder_name)
+        return {
+            'pdf_path': pdf_path,
+            'filename': new_filename,
+            'file_hash': OCRController.get_file_hash(pdf_path),
+            'text': full_text,
+            'extracted_data': {
+                'date': new_filename.split('_')[0],
+                'supplier': extracted.get('supplier'),
+                'invoice': extracted.get('invoice'),
+                'original_text': full_text[:1000]  # Premiers 1000 caractères
+            }
+        }
+    
+    @staticmethod
+    def publish_pdf(analysis, output_folder="output", record=True):
+        """
+        Copie le PDF analysé sous son nouveau nom dans le dossier de sortie
+        Retourne le résultat (analyse + output_path) ou None
+        """
+        pdf_path = analysis['pdf_path']
+        new_filename = analysis['filename']
         
         # Déterminer le sous-dossier de sortie (garder la même structure)
         # Extraire le chemin relatif depuis scan/
@@ -125,34 +1042,50 @@ class OCRController:
         output_path = os.path.join(output_subfolder, new_filename)
         
         try:
-            shutil.copy2(pdf_path, output_path)
+            with RunMetrics.timer('publish'):
+                shutil.copy2(pdf_path, output_path)
             OCRController.logger.info(f"✓ PDF copié et renommé: {output_path}")
-            
-            # Enregistrer pour apprentissage
-            extracted_data = {
-                'date': new_filename.split('_')[0],
-                'supplier': extracted.get('supplier'),
-                'invoice': extracted.get('invoice'),
-                'original_text': full_text[:1000]  # Premiers 1000 caractères
-            }
-            
-            OCRController.learning_system.record_extraction(
-                pdf_path, full_text, extracted_data, new_filename
-            )
-            
-            # Sauvegarder pour révision potentielle  
-            try:
-                import sys
-                sys.path.append('scripts')
-                from review_results import ReviewInterface
-                review = ReviewInterface()
-                review.save_extraction_for_review(pdf_path, full_text, extracted_data, new_filename)
-            except ImportError:
-                # Si l'import échoue, continuer sans sauvegarder pour révision
-                pass
-            
-            return output_path
         except Exception as e:
             OCRController.logger.error(f"Erreur lors de la copie du PDF: {e}")
             return None
-
+        
+        result = dict(analysis, output_path=output_path)
+        
+        if record:
+            OCRController.record_result(result)
+        
+        return result
+    
+    @staticmethod
+    def record_result(result):
+        """Enregistre un résultat pour apprentissage et révision (processus parent)"""
+        # Les fichiers JSON d'apprentissage ne supportent pas les écritures concurrentes
+        with OCRController._record_lock:
+            OCRController._record_result(result)
+    
+    @staticmethod
+    def _record_result(result):
+        pdf_path = result['pdf_path']
+        full_text = result['text']
+        extracted_data = result['extracted_data']
+        new_filename = result['filename']
+        
+        try:
+            with RunMetrics.timer('record_learning'):
+                OCRController.learning_system.record_extraction(
+                    pdf_path, full_text, extracted_data, new_filename
+                )
+        except Exception as e:
+            OCRController.logger.error(f"Erreur enregistrement apprentissage: {e}")
+        
+        # Sauvegarder pour révision potentielle  
+        try:
+            import sys
+            sys.path.append('scripts')
+            from review_results import ReviewInterface
+            with RunMetrics.timer('record_review'):
+                review = ReviewInterface()
+                review.save_extraction_for_review(pdf_path, full_text, extracted_data, new_filename)
+        except ImportError:
+            # Si l'import échoue, continuer sans sauvegarder pour révision
+            pass
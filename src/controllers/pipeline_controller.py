@@ -0,0 +1,149 @@
+# src/controllers/pipeline_controller.py
+import threading
+from src.controllers.file_controller import FileController
+from src.controllers.ocr_controller import OCRController
+from src.utils.concurrent_manager import ConcurrentManager
+from src.utils.logger import Logger
+from src.utils.pipeline import Pipeline
+
+
+class PipelineController:
+    """
+    Traitement en pipeline: découverte → rastérisation → OCR → analyse → publication
+    Chaque étage a son nombre de workers et une file bornée le sépare du suivant
+    """
+
+    logger = Logger()
+
+    DEFAULT_WORKERS = {
+        'discover': 1,
+        'rasterize': 2,
+        'ocr': None,  # None = cœurs / threads OpenMP de Tesseract
+        'analyze': 1,
+        'publish': 2
+    }
+
+    def __init__(self, output_folder="output", settings=None, file_filter=None, on_result=None):
+        """
+        file_filter(files) retourne les fichiers à traiter parmi ceux découverts
+        on_result(result) est appelé après chaque publication
+        """
+        settings = settings or {}
+        self.output_folder = output_folder
+        self.file_filter = file_filter
+        self.on_result = on_result
+        self.discovered = []
+        self.queue_size = settings.get('queue_size', 8)
+        # Pages envoyées ensemble au moteur OCR (éventuellement de plusieurs PDF)
+        self.ocr_batch_size = settings.get('ocr_batch_size', 1)
+        self.workers = dict(self.DEFAULT_WORKERS, **settings.get('workers', {}))
+        if not self.workers['ocr']:
+            self.workers['ocr'] = ConcurrentManager.get_max_workers()
+
+        # Pages OCRisées en attente de réassemblage, par document
+        self._documents = {}
+        # Documents dont l'OCR d'une page a échoué: non publiés
+        self._failed = set()
+        self._documents_lock = threading.Lock()
+
+    def run(self, folder_paths):
+        """Traite tous les dossiers et retourne les résultats publiés"""
+        pipeline = Pipeline(self.queue_size)
+        pipeline.add_stage('discover', self.discover, self.workers['discover'])
+        pipeline.add_stage('rasterize', self.rasterize, self.workers['rasterize'])
+        pipeline.add_stage('ocr', self.ocr, self.workers['ocr'], batch_size=self.ocr_batch_size)
+        pipeline.add_stage('analyze', self.analyze, self.workers['analyze'])
+        pipeline.add_stage('publish', self.publish, self.workers['publish'])
+
+        self.logger.info(f"Pipeline: {self.workers} (file max: {self.queue_size})")
+        if OCRController.is_adaptive():
+            self.logger.warning("OCR adaptatif non supporté par le pipeline, toutes les pages seront OCRisées")
+        results = pipeline.run(folder_paths)
+
+        for pdf_path in self._documents:
+            self.logger.warning(f"Document incomplet, non publié: {pdf_path}")
+
+        return results
+
+    def discover(self, folder_path, emit):
+        """Étage 1: liste les PDF d'un dossier"""
+        files = FileController.explore_folder(folder_path)
+        if not files:
+            self.logger.warning(f"No PDF files found in {folder_path}")
+        if self.file_filter:
+            files = self.file_filter(files)
+        self.discovered.extend(files)
+        for file in files:
+            emit(file)
+
+    def rasterize(self, pdf_path, emit):
+        """Étage 2: rastérise le PDF page par page"""
+        # Contenu déjà OCRisé ou PDF natif: les pages passent directement à l'analyse
+        page_texts = OCRController.lookup_pages(pdf_path)
+        if page_texts is not None and None not in page_texts:
+            with self._documents_lock:
+                self._documents[pdf_path] = [None] * len(page_texts)
+            for page_number, text in enumerate(page_texts, 1):
+                emit({'pdf_path': pdf_path, 'page_number': page_number, 'text': text})
+            return
+
+        page_count = OCRController.get_page_count(pdf_path)
+        if page_count == 0:
+            self.logger.warning(f"No images extracted from {pdf_path}")
+            return
+
+        with self._documents_lock:
+            self._documents[pdf_path] = [None] * page_count
+
+        for page_number, image in OCRController.iter_page_images(pdf_path, page_count=page_count):
+            emit({'pdf_path': pdf_path, 'page_number': page_number, 'image': image})
+
+    def ocr(self, pages, emit):
+        """
+        Étage 3: OCR des pages disponibles (une page, ou un lot avec ocr_batch_size)
+        Une page en échec garde le texte None: seul son document est écarté
+        """
+        if isinstance(pages, dict):
+            pages = [pages]
+
+        to_ocr = [page for page in pages if 'image' in page]
+        try:
+            texts = OCRController.ocr_pages(
+                [(page['pdf_path'], page['page_number'], page['image']) for page in to_ocr]
+            )
+            for page, text in zip(to_ocr, texts):
+                page['text'] = text
+        finally:
+            for page in to_ocr:
+                OCRController.release_page(page.pop('image'))
+
+        for page in pages:
+            emit(page)
+
+    def analyze(self, page, emit):
+        """Étage 4: réassemble les pages dans l'ordre puis analyse le document"""
+        pdf_path = page['pdf_path']
+        with self._documents_lock:
+            page_texts = self._documents[pdf_path]
+            if page['text'] is None:
+                self._failed.add(pdf_path)
+            page_texts[page['page_number'] - 1] = page['text'] or ''
+            if any(text is None for text in page_texts):
+                return
+            del self._documents[pdf_path]
+            if pdf_path in self._failed:
+                self._failed.discard(pdf_path)
+                self.logger.error(f"Document en échec (OCR d'une page impossible): {pdf_path}")
+                return
+
+        analysis = OCRController.analyze_pdf(pdf_path, page_texts)
+        if analysis is not None:
+            emit(analysis)
+
+    def publish(self, analysis, emit):
+        """Étage 5: copie le PDF renommé et enregistre l'apprentissage"""
+        result = OCRController.publish_pdf(analysis, self.output_folder, record=True)
+        if result is not None:
+            if self.on_result:
+                self.on_result(result)
+            emit(result)
@@ -0,0 +1,98 @@
+# src/controllers/watch_controller.py
+import signal
+import threading
+from functools import partial
+from src.controllers.ocr_controller import OCRController
+from src.utils.concurrent_manager import ConcurrentManager
+from src.utils.folder_watcher import FolderWatcher
+from src.utils.logger import Logger
+
+
+class WatchController:
+    """
+    Mode démon: surveille les dossiers de scan et traite chaque nouveau PDF
+    dès son arrivée sur un pool de workers gardé actif
+    """
+
+    logger = Logger()
+
+    def __init__(self, config, folder_paths, output_folder="output", manifest=None):
+        self.config = config
+        self.folder_paths = folder_paths
+        self.output_folder = output_folder
+        self.manifest = manifest
+        self.stop_event = threading.Event()
+
+        self._in_flight = set()
+        self._in_flight_lock = threading.Lock()
+
+    def stop(self, *_):
+        """Demande un arrêt propre (les documents en cours sont terminés)"""
+        if not self.stop_event.is_set():
+            self.logger.info("Arrêt demandé, fin des traitements en cours...")
+        self.stop_event.set()
+
+    def run(self):
+        """Boucle principale du démon"""
+        concurrency = self.config.get('concurrency', {})
+        engine = concurrency.get('engine', 'thread')
+        if engine not in ConcurrentManager.ENGINES:
+            engine = 'thread'
+        watch_settings = self.config.get('watch', {})
+
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+
+        process_pdf_with_output = partial(OCRController.process_pdf, output_folder=self.output_folder, record=False)
+        watcher = FolderWatcher(
+            self.folder_paths,
+            poll_interval=watch_settings.get('poll_interval', 5),
+            use_inotify=watch_settings.get('use_inotify', True)
+        )
+
+        executor = ConcurrentManager.create_executor(engine, concurrency.get('max_workers'), self.config)
+        try:
+            # Fichiers déjà présents signalés en premier, une fois la surveillance en place
+            self.logger.info("Démon démarré, en attente de nouveaux PDF (Ctrl+C pour arrêter)")
+            for file in watcher.watch(self.stop_event, include_existing=True):
+                for pending_file in self._pending([file]):
+                    self.logger.info(f"Fichier à traiter: {pending_file}")
+                    self._submit(executor, process_pdf_with_output, pending_file)
+        finally:
+            executor.shutdown(wait=True)
+            if self.manifest:
+                self.manifest.flush()
+            self.logger.info("Démon arrêté")
+
+    def _pending(self, files):
+        """Filtre les fichiers déjà traités ou en cours de traitement"""
+        if self.manifest:
+            files = self.manifest.filter_pending(files)
+        with self._in_flight_lock:
+            return [file for file in files if file not in self._in_flight]
+
+    def _submit(self, executor, function, file):
+        with self._in_flight_lock:
+            self._in_flight.add(file)
+        future = ConcurrentManager.submit(executor, function, file)
+        future.add_done_callback(lambda done, file=file: self._on_done(file, done))
+
+    def _on_done(self, file, future):
+        """Appelé à la fin de chaque document (enregistrement dans le processus principal)"""
+        try:
+            result = ConcurrentManager.get_result(future)
+        except Exception as e:
+            self.logger.error(f"Erreur lors du traitement de {file}: {e}")
+            result = None
+
+        try:
+            if result is not None:
+                OCRController.record_result(result)
+            if self.manifest:
+                if result is not None:
+                    self.manifest.record_result(result)
+                else:
+                    self.manifest.record(file, None, self.manifest.STATUS_FAILED)
+        finally:
+            with self._in_flight_lock:
+                self._in_flight.discard(file)
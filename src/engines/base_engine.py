@@ -0,0 +1,48 @@
+from abc import ABC, abstractmethod
+from src.utils.logger import Logger
+
+
+class BaseEngine(ABC):
+    """
+    Classe de base des moteurs OCR
+    Une page est une image PIL ou le chemin d'un fichier image
+    options (facultatif): language, psm, oem, tessdata_dir, appliqués à l'appel
+    """
+
+    name = None
+
+    def __init__(self, language='eng'):
+        self.logger = Logger()
+        self.language = language
+
+    @classmethod
+    def is_available(cls):
+        """Vrai si les dépendances du moteur sont installées"""
+        return True
+
+    @abstractmethod
+    def get_version(self):
+        """Version de Tesseract utilisée (incluse dans la clé du cache OCR)"""
+        pass
+
+    def get_language(self, options=None):
+        """Langue(s) Tesseract de l'appel (ex: 'fra+eng')"""
+        return (options or {}).get('language') or self.language
+
+    @abstractmethod
+    def recognize(self, page, options=None):
+        """Retourne le texte de la page"""
+        pass
+
+    @abstractmethod
+    def recognize_with_confidence(self, page, options=None):
+        """Retourne (texte, confiance moyenne des mots 0-100)"""
+        pass
+
+    def recognize_batch(self, pages, options=None):
+        """Retourne le texte de chaque page (un appel par page par défaut)"""
+        return [self.recognize(page, options) for page in pages]
+
+    def close(self):
+        """Libère les ressources gardées entre deux pages"""
+        pass
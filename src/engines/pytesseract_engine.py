@@ -0,0 +1,78 @@
+import os
+import tempfile
+import pytesseract
+from src.engines.base_engine import BaseEngine
+
+
+class PytesseractEngine(BaseEngine):
+    """Moteur historique: un processus tesseract lancé à chaque appel"""
+
+    name = 'pytesseract'
+
+    def get_version(self):
+        return str(pytesseract.get_tesseract_version())
+
+    def get_arguments(self, options=None):
+        """Arguments pytesseract (lang, config) correspondant aux options"""
+        options = options or {}
+        config = []
+        if options.get('psm') is not None:
+            config.append(f"--psm {int(options['psm'])}")
+        if options.get('oem') is not None:
+            config.append(f"--oem {int(options['oem'])}")
+        if options.get('tessdata_dir'):
+            config.append(f'--tessdata-dir "{options["tessdata_dir"]}"')
+        return {'lang': self.get_language(options), 'config': ' '.join(config)}
+
+    def recognize(self, page, options=None):
+        return pytesseract.image_to_string(page, **self.get_arguments(options))
+
+    def recognize_batch(self, pages, options=None):
+        """
+        Un seul processus tesseract pour toutes les pages: il lit une liste
+        d'images et sépare le texte de chaque page par un saut de page (\\f)
+        """
+        if len(pages) < 2:
+            return [self.recognize(page, options) for page in pages]
+
+        with tempfile.TemporaryDirectory(prefix='ocr_batch_') as folder:
+            paths = []
+            for index, page in enumerate(pages):
+                if isinstance(page, str):
+                    paths.append(os.path.abspath(page))
+                    continue
+                # Format non compressé: écriture rapide, lu directement par tesseract
+                path = os.path.join(folder, f"page_{index}.ppm")
+                (page if page.mode in ('1', 'L', 'RGB') else page.convert('RGB')).save(path)
+                paths.append(path)
+
+            list_path = os.path.join(folder, 'pages.txt')
+            with open(list_path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(paths) + '\n')
+
+            output = pytesseract.image_to_string(list_path, **self.get_arguments(options))
+
+        texts = output.split('\f')
+        if len(texts) < len(pages):
+            raise ValueError(f"{len(texts)} page(s) reçue(s) de tesseract pour {len(pages)} envoyée(s)")
+        return texts[:len(pages)]
+
+    def recognize_with_confidence(self, page, options=None):
+        data = pytesseract.image_to_data(page, output_type=pytesseract.Output.DICT, **self.get_arguments(options))
+
+        # Reconstituer les lignes à partir des mots
+        lines = {}
+        confidences = []
+        for index, word in enumerate(data['text']):
+            if not word or not word.strip():
+                continue
+            line_key = (data['block_num'][index], data['par_num'][index], data['line_num'][index])
+            lines.setdefault(line_key, []).append(word)
+            confidence = float(data['conf'][index])
+            if confidence >= 0:
+                confidences.append(confidence)
+
+        text = '\n'.join(' '.join(words) for words in lines.values())
+        # Aucun mot reconnu: confiance nulle
+        confidence = sum(confidences) / len(confidences) if confidences else 0
+        return text, confidence
@@ -0,0 +1,98 @@
+import importlib
+import importlib.util
+import threading
+from src.engines.base_engine import BaseEngine
+
+# Importé au premier usage: charger libtesseract (et libgomp) lit OMP_THREAD_LIMIT,
+# qui doit être fixé avant (ThreadTuner.setup, initialisation des workers)
+tesserocr = None
+
+
+class TesserocrEngine(BaseEngine):
+    """
+    Moteur persistant: libtesseract chargé une fois par thread (tesserocr)
+    Le modèle de langue reste en mémoire d'une page à l'autre, sans lancer
+    de processus par page
+    """
+
+    name = 'tesserocr'
+
+    def __init__(self, language='eng'):
+        super().__init__(language)
+        self._local = threading.local()
+        self._apis = []
+        self._apis_lock = threading.Lock()
+
+    @classmethod
+    def is_available(cls):
+        """Vrai si tesserocr est installé (sans charger libtesseract)"""
+        return tesserocr is not None or importlib.util.find_spec('tesserocr') is not None
+
+    @staticmethod
+    def load_module():
+        """Module tesserocr, importé une seule fois"""
+        global tesserocr
+        if tesserocr is None:
+            tesserocr = importlib.import_module('tesserocr')
+        return tesserocr
+
+    def get_api(self, options=None):
+        """
+        API Tesseract du thread courant pour ces options (créée au premier appel)
+        Une API par combinaison langue/psm/oem/modèle, gardée chargée
+        """
+        options = options or {}
+        key = (self.get_language(options), options.get('psm'), options.get('oem'), options.get('tessdata_dir'))
+        apis = getattr(self._local, 'apis', None)
+        if apis is None:
+            apis = self._local.apis = {}
+
+        api = apis.get(key)
+        if api is None:
+            language, psm, oem, tessdata_dir = key
+            arguments = {'lang': language}
+            if psm is not None:
+                arguments['psm'] = int(psm)
+            if oem is not None:
+                arguments['oem'] = int(oem)
+            if tessdata_dir:
+                arguments['path'] = tessdata_dir
+            api = self.load_module().PyTessBaseAPI(**arguments)
+            apis[key] = api
+            with self._apis_lock:
+                self._apis.append(api)
+            self.logger.debug(f"Moteur tesserocr initialisé ({language}, psm={psm}, oem={oem})")
+        return api
+
+    def _set_page(self, api, page):
+        if isinstance(page, str):
+            api.SetImageFile(page)
+        else:
+            api.SetImage(page)
+
+    def get_version(self):
+        return self.load_module().tesseract_version().split()[1]
+
+    def recognize(self, page, options=None):
+        api = self.get_api(options)
+        try:
+            self._set_page(api, page)
+            return api.GetUTF8Text()
+        finally:
+            api.Clear()
+
+    def recognize_with_confidence(self, page, options=None):
+        api = self.get_api(options)
+        try:
+            self._set_page(api, page)
+            text = api.GetUTF8Text()
+            return text, api.MeanTextConf()
+        finally:
+            api.Clear()
+
+    def close(self):
+        with self._apis_lock:
+            for api in self._apis:
+                api.End()
+            self._apis = []
+        self._local = threading.local()
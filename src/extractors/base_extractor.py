@@ -1,25 +1,78 @@
+import threading
 from abc import ABC, abstractmethod
-import json
-import os
+from src.extractors.rule_set import RuleSet
+from src.utils.config_registry import ConfigRegistry, FrozenDict
+from src.utils.keyword_automaton import KeywordAutomaton
 from src.utils.logger import Logger
 
 
 class BaseExtractor(ABC):
     """Classe de base pour tous les extracteurs de métadonnées"""
     
+    RULES_PATH = 'src/config/extraction_rules.json'
+    
+    # Automate des mots-clés et fichiers dont il est issu
+    # (même objet vide pour un fichier absent: pas de reconstruction à chaque appel)
+    _NO_CONFIG = FrozenDict()
+    _keyword_automaton = None
+    _keyword_sources = ()
+    _keyword_lock = threading.Lock()
+    
     def __init__(self):
         self.logger = Logger()
         self.rules = self.load_rules()
+        self.rule_set = self.get_rule_set()
     
+    @classmethod
+    def preload_rules(cls):
+        """
+        Règles partagées par tous les extracteurs du processus (lecture seule)
+        Le fichier n'est relu que s'il a été modifié
+        """
+        return ConfigRegistry.get(cls.RULES_PATH, FrozenDict())
+
+    @classmethod
+    def get_rule_set(cls):
+        """
+        Règles avec motifs compilés, construites une fois par version du fichier
+        ValueError si un motif est invalide
+        """
+        rules = cls.preload_rules()
+        return ConfigRegistry.derive(cls.RULES_PATH, 'rule_set', rules, lambda: RuleSet.from_rules(rules))
+
+    @staticmethod
+    def get_keyword_automaton():
+        """
+        Automate partagé des mots-clés du fournisseur: indicateurs d'entreprise,
+        infos utilisateur et zones de la config hiérarchique (tous dossiers) et
+        du profil utilisateur. Dates et numéros cherchent leurs quelques
+        mots-clés directement (KeywordHits.search)
+        Reconstruit seulement si l'un de ces fichiers a changé
+        """
+        from src.extractors.supplier_extractor import SupplierExtractor
+        from src.utils.hierarchical_config import HierarchicalConfig
+        
+        rule_set = BaseExtractor.get_rule_set()
+        hierarchical = ConfigRegistry.get(HierarchicalConfig.CONFIG_FILE, BaseExtractor._NO_CONFIG)
+        profile = ConfigRegistry.get(SupplierExtractor.USER_PROFILE_PATH, BaseExtractor._NO_CONFIG)
+        sources = (rule_set, hierarchical, profile)
+        
+        with BaseExtractor._keyword_lock:
+            cached = BaseExtractor._keyword_sources
+            if len(cached) == len(sources) and all(a is b for a, b in zip(cached, sources)):
+                return BaseExtractor._keyword_automaton
+            
+            keywords = set(rule_set.supplier_rules.company_indicators)
+            keywords.update(HierarchicalConfig.collect_keywords(hierarchical))
+            keywords.update(HierarchicalConfig.collect_section_keywords(profile))
+            
+            BaseExtractor._keyword_automaton = KeywordAutomaton(keywords)
+            BaseExtractor._keyword_sources = sources
+            return BaseExtractor._keyword_automaton
+
     def load_rules(self):
         """Charge les règles de configuration"""
-        rules_path = 'src/config/extraction_rules.json'
-        try:
-            with open(rules_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            self.logger.error(f"Erreur chargement règles: {e}")
-            return {}
+        return self.preload_rules()
     
     @abstractmethod
     def extract(self, text):
@@ -1,6 +1,6 @@
-import re
 from datetime import datetime
 from src.extractors.base_extractor import BaseExtractor
+from src.utils.keyword_automaton import KeywordHits
 
 
 class DateExtractor(BaseExtractor):
@@ -18,53 +18,47 @@ class DateExtractor(BaseExtractor):
     def extract(self, text):
         """Extrait la date la plus probable du document"""
         text_lower = text.lower()
+        # Positions des mots-clés cherchées une fois par mot-clé, pour toutes les dates
+        hits = KeywordHits.search(text_lower)
         candidates = []
         
-        # Parcourir tous les types de patterns configurés
-        for pattern_type, config in self.rules.get('date_patterns', {}).items():
-            patterns = config.get('patterns', [])
-            keywords = config.get('keywords', [])
-            priority = config.get('priority', 5)
+        # Tous les patterns configurés en un seul passage sur le texte
+        for order, rule, match, groups in self.rule_set.date_scanner.scan(text_lower):
+            # Calculer le score
+            score = self.calculate_date_score(
+                hits, match.start(), rule.keywords, rule.priority
+            )
             
-            for pattern in patterns:
-                matches = re.finditer(pattern, text_lower)
-                for match in matches:
-                    # Calculer le score
-                    score = self.calculate_date_score(
-                        text_lower, match, keywords, priority
-                    )
-                    
-                    # Parser la date
-                    parsed_date = self.parse_date(match, pattern_type)
-                    if parsed_date:
-                        candidates.append({
-                            'date': parsed_date,
-                            'score': score,
-                            'type': pattern_type,
-                            'original': match.group()
-                        })
+            # Parser la date
+            parsed_date = self.parse_date(groups, rule.name)
+            if parsed_date:
+                candidates.append({
+                    'date': parsed_date,
+                    'score': score,
+                    'type': rule.name,
+                    'order': order,
+                    'original': match.group()
+                })
         
         if not candidates:
             self.logger.debug("Aucune date trouvée")
             return None
         
-        # Trier par score et retourner la meilleure
-        candidates.sort(key=lambda x: x['score'], reverse=True)
+        # Trier par score et retourner la meilleure (à égalité: ordre des patterns, puis du texte)
+        candidates.sort(key=lambda x: (-x['score'], x['order']))
         best = candidates[0]
         
         self.logger.info(f"Date extraite: {best['date']} (score: {best['score']:.1f}, type: {best['type']})")
         return best['date']
     
-    def calculate_date_score(self, text, match, keywords, base_priority):
+    def calculate_date_score(self, hits, position, keywords, base_priority):
         """Calcule le score d'une date trouvée"""
-        position = match.start()
         score = base_priority * 10
         
         # Bonus pour proximité avec mots-clés
         for keyword in keywords:
             # Chercher en arrière (max 50 caractères)
-            search_start = max(0, position - 50)
-            keyword_pos = text.rfind(keyword, search_start, position)
+            keyword_pos = hits.last_before(keyword, position, 50)
             if keyword_pos != -1:
                 distance = position - keyword_pos
                 score += (50 - distance) * 2
@@ -75,11 +69,9 @@ class DateExtractor(BaseExtractor):
         
         return score
     
-    def parse_date(self, match, pattern_type):
-        """Parse une date selon son type"""
+    def parse_date(self, groups, pattern_type):
+        """Parse une date (groupes jour, mois, année du pattern) selon son type"""
         try:
-            groups = match.groups()
-            
             if pattern_type == 'french_text':
                 # Format avec mois en texte
                 day = groups[0].zfill(2)
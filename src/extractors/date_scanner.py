@@ -0,0 +1,110 @@
+# src/extractors/date_scanner.py
+import re
+
+# Références arrière (\1, (?P=nom)): leur numéro change une fois les motifs fusionnés
+BACKREFERENCE = re.compile(r'\\[1-9]|\(\?P=')
+
+# Début de motif de largeur nulle ou ouvrant des groupes: \b, ^, (, (?:, (?P<nom>
+LEADING_PREFIX = re.compile(r'(?:\\b|\^|\((?:\?:|\?P<\w+>)?)*')
+# Premier élément: un chiffre (\d, [0-9], [12], littéral), au moins une fois
+LEADING_DIGIT = re.compile(r'(?:\\d|\[(?:\d(?:-\d)?)+\]|\d)(?![?*]|\{0*[,}])')
+
+
+class DateScanner:
+    """
+    Motifs de dates fusionnés en une seule alternative à groupes nommés:
+    le texte est parcouru une fois, quel que soit le nombre de motifs
+    Les motifs incompatibles (drapeaux différents, références arrière,
+    noms de groupes en double) sont parcourus un par un comme avant
+    """
+
+    def __init__(self, alternatives):
+        """alternatives: [(étiquette, motif compilé)], dans l'ordre de priorité"""
+        self.alternatives = tuple(alternatives)
+        self.slots = {}
+        self.pattern = None
+
+        if not self.alternatives:
+            return
+        flags = {pattern.flags for _, pattern in self.alternatives}
+        if len(flags) > 1 or any(BACKREFERENCE.search(pattern.pattern) for _, pattern in self.alternatives):
+            return
+
+        parts = []
+        group = 1
+        for order, (label, pattern) in enumerate(self.alternatives):
+            name = f"date_{order}"
+            parts.append(f"(?P<{name}>{pattern.pattern})")
+            # Groupes du motif d'origine, à la suite du groupe nommé qui l'englobe
+            self.slots[name] = (order, label, group, pattern.groups)
+            group += pattern.groups + 1
+        source = '|'.join(parts)
+        # Toutes les dates commencent par un chiffre: les autres positions sont
+        # écartées sans essayer chaque motif
+        if all(DateScanner.starts_with_digit(pattern) for _, pattern in self.alternatives):
+            source = f"(?=\\d)(?:{source})"
+        try:
+            self.pattern = re.compile(source, flags.pop())
+        except re.error:
+            self.slots = {}
+
+    @staticmethod
+    def starts_with_digit(pattern):
+        """
+        Vrai si toute correspondance du motif commence par un chiffre, d'après
+        le texte du motif: ancres et ouvertures de groupes, puis un chiffre
+        obligatoire qu'aucune alternative (|) ne contourne
+        Faux dans le doute: le motif est alors essayé à chaque position
+        """
+        source = pattern.pattern
+        if pattern.flags & re.VERBOSE:
+            return False
+        prefix = LEADING_PREFIX.match(source)
+        if not LEADING_DIGIT.match(source, prefix.end()):
+            return False
+
+        # Groupes ouverts avant le chiffre: une alternative à leur niveau (ou au
+        # niveau du motif entier) permet une correspondance sans ce chiffre
+        depth = enclosing = prefix.group().count('(')
+        position = prefix.end()
+        in_class = False
+        while position < len(source):
+            character = source[position]
+            if character == '\\':
+                position += 2
+                continue
+            if in_class:
+                in_class = character != ']'
+            elif character == '[':
+                in_class = True
+                # ] juste après [ ou [^ fait partie de la classe
+                position += 2 if source.startswith('^', position + 1) else 1
+                if source.startswith(']', position):
+                    position += 1
+                continue
+            elif character == '(':
+                depth += 1
+            elif character == ')':
+                depth -= 1
+                enclosing = min(enclosing, depth)
+            elif character == '|' and depth <= enclosing:
+                return False
+            position += 1
+        return True
+
+    def scan(self, text):
+        """
+        Dates trouvées: (ordre du motif, étiquette, match, groupes du motif)
+        Ordre de parcours du texte en un passage, motif par motif sinon
+        """
+        if self.pattern is None:
+            for order, (label, pattern) in enumerate(self.alternatives):
+                for match in pattern.finditer(text):
+                    yield order, label, match, match.groups()
+            return
+
+        for match in self.pattern.finditer(text):
+            # Le groupe nommé englobant se ferme en dernier: lastgroup désigne le motif
+            order, label, first, count = self.slots[match.lastgroup]
+            yield order, label, match, match.groups()[first:first + count]
+
@@ -5,18 +5,23 @@ from src.extractors.base_extractor import BaseExtractor
 class InvoiceExtractor(BaseExtractor):
     """Extracteur pour les numéros de facture et références"""
     
+    # Motifs fixes compilés une fois
+    TRAILING_PUNCTUATION = re.compile(r'[\s\.,;:]+$')
+    WHITESPACE = re.compile(r'\s+')
+    DIGIT = re.compile(r'\d')
+    PHONE_NUMBER = re.compile(r'^0\d{9}$')
+    NUMERIC_DATE = re.compile(r'^\d{2}/\d{2}/\d{4}$')
+    STANDARD_PREFIX = re.compile(r'^(FAC|INV|REF|CMD|BC|DEV)', re.IGNORECASE)
+    STRUCTURED_NUMBER = re.compile(r'^[A-Z]+[-/]?\d+', re.IGNORECASE)
+    
     def extract(self, text):
         """Extrait le numéro de facture ou référence le plus probable"""
         text_lower = text.lower()
         candidates = []
         
-        # Parcourir les différents types de patterns
-        for pattern_type, config in self.rules.get('invoice_patterns', {}).items():
-            keywords = config.get('keywords', [])
-            patterns = config.get('patterns', [])
-            max_length = config.get('max_length', 30)
-            
-            for keyword in keywords:
+        # Parcourir les différents types de patterns (compilés au chargement)
+        for rule in self.rule_set.invoice_rules:
+            for keyword in rule.keywords:
                 # Chercher le mot-clé dans le texte
                 pos = text_lower.find(keyword)
                 if pos != -1:
@@ -25,23 +30,23 @@ class InvoiceExtractor(BaseExtractor):
                     context = text[context_start:context_start + 100]
                     
                     # Appliquer les patterns
-                    for pattern in patterns:
-                        match = re.search(pattern, context, re.IGNORECASE)
+                    for pattern in rule.patterns:
+                        match = pattern.search(context)
                         if match:
                             value = match.group(1).strip()
                             
                             # Nettoyer et valider
-                            value = self.clean_invoice_number(value, max_length)
+                            value = self.clean_invoice_number(value, rule.max_length)
                             
                             if value and self.is_valid_invoice_number(value):
                                 score = self.calculate_invoice_score(
-                                    value, keyword, pattern_type, pos
+                                    value, keyword, rule.name, pos
                                 )
                                 
                                 candidates.append({
                                     'number': value,
                                     'score': score,
-                                    'type': pattern_type,
+                                    'type': rule.name,
                                     'keyword': keyword
                                 })
         
@@ -61,29 +66,29 @@ class InvoiceExtractor(BaseExtractor):
         value = value.strip()
         
         # Enlever les caractères non désirés à la fin
-        value = re.sub(r'[\s\.,;:]+$', '', value)
+        value = self.TRAILING_PUNCTUATION.sub('', value)
         
         # Limiter la longueur
         if len(value) > max_length:
             value = value[:max_length]
         
         # Remplacer les espaces par des underscores
-        value = re.sub(r'\s+', '_', value)
+        value = self.WHITESPACE.sub('_', value)
         
         return value
     
     def is_valid_invoice_number(self, value):
         """Vérifie si c'est un numéro valide"""
         # Doit contenir au moins un chiffre
-        if not re.search(r'\d', value):
+        if not self.DIGIT.search(value):
             return False
         
         # Ne doit pas être juste un nombre de téléphone
-        if re.match(r'^0\d{9}$', value):
+        if self.PHONE_NUMBER.match(value):
             return False
         
         # Ne doit pas être une date
-        if re.match(r'^\d{2}/\d{2}/\d{4}$', value):
+        if self.NUMERIC_DATE.match(value):
             return False
         
         # Longueur minimale
@@ -106,7 +111,7 @@ class InvoiceExtractor(BaseExtractor):
         score += type_scores.get(pattern_type, 10)
         
         # Bonus si contient un préfixe standard
-        if re.match(r'^(FAC|INV|REF|CMD|BC|DEV)', value, re.IGNORECASE):
+        if self.STANDARD_PREFIX.match(value):
             score += 20
         
         # Bonus si proche du début
@@ -114,7 +119,7 @@ class InvoiceExtractor(BaseExtractor):
             score += 15
         
         # Bonus si format structuré (lettres et chiffres)
-        if re.match(r'^[A-Z]+[-/]?\d+', value, re.IGNORECASE):
+        if self.STRUCTURED_NUMBER.match(value):
             score += 15
         
         return score
\ No newline at end of file
@@ -0,0 +1,109 @@
+# src/extractors/rule_set.py
+import re
+from collections import namedtuple
+from src.extractors.date_scanner import DateScanner
+
+# Règles d'extraction avec leurs motifs compilés (tuples de re.Pattern)
+DateRule = namedtuple('DateRule', 'name patterns keywords priority')
+InvoiceRule = namedtuple('InvoiceRule', 'name patterns keywords max_length')
+SupplierRules = namedtuple('SupplierRules', 'company_indicators removal_patterns')
+
+
+class RuleSet(namedtuple('RuleSet', 'date_rules invoice_rules supplier_rules date_scanner')):
+    """
+    Règles de extraction_rules.json compilées une seule fois
+    Un motif invalide (syntaxe, groupes manquants, drapeau inconnu) lève
+    ValueError au chargement, pas pendant l'extraction
+    """
+
+    __slots__ = ()
+
+    FLAGS = {
+        'IGNORECASE': re.IGNORECASE,
+        'MULTILINE': re.MULTILINE,
+        'DOTALL': re.DOTALL,
+        'ASCII': re.ASCII,
+        'VERBOSE': re.VERBOSE
+    }
+
+    # Drapeaux par défaut: dates cherchées dans le texte en minuscules,
+    # numéros dans le texte d'origine
+    DATE_FLAGS = 0
+    INVOICE_FLAGS = re.IGNORECASE
+    REMOVAL_FLAGS = re.IGNORECASE
+
+    @staticmethod
+    def compile_pattern(pattern, flags, location, min_groups=0):
+        """Compile un motif; ValueError indiquant la règle fautive sinon"""
+        try:
+            compiled = re.compile(pattern, flags)
+        except (re.error, TypeError) as e:
+            raise ValueError(f"Motif invalide dans {location}: {pattern!r} ({e})") from e
+        if compiled.groups < min_groups:
+            raise ValueError(f"Motif {pattern!r} dans {location}: {min_groups} groupe(s) attendu(s), "
+                             f"{compiled.groups} trouvé(s)")
+        return compiled
+
+    @staticmethod
+    def parse_flags(names, default, location):
+        """Drapeaux d'une règle ("flags": ["IGNORECASE", ...]), default si absents"""
+        if names is None:
+            return default
+        if isinstance(names, str):
+            names = [names]
+        flags = 0
+        for name in names:
+            if name not in RuleSet.FLAGS:
+                raise ValueError(f"Drapeau inconnu dans {location}: {name!r}")
+            flags |= RuleSet.FLAGS[name]
+        return flags
+
+    @staticmethod
+    def compile_patterns(patterns, flags, location, min_groups=0):
+        return tuple(
+            RuleSet.compile_pattern(pattern, flags, f"{location}.patterns[{index}]", min_groups)
+            for index, pattern in enumerate(patterns)
+        )
+
+    @classmethod
+    def from_rules(cls, rules):
+        """Compile les sections date_patterns, invoice_patterns et supplier_rules"""
+        date_rules = []
+        for name, config in rules.get('date_patterns', {}).items():
+            location = f"date_patterns.{name}"
+            flags = cls.parse_flags(config.get('flags'), cls.DATE_FLAGS, location)
+            date_rules.append(DateRule(
+                name,
+                # Jour, mois et année sont lus dans les trois premiers groupes
+                cls.compile_patterns(config.get('patterns', []), flags, location, min_groups=3),
+                tuple(config.get('keywords', [])),
+                config.get('priority', 5)
+            ))
+
+        invoice_rules = []
+        for name, config in rules.get('invoice_patterns', {}).items():
+            location = f"invoice_patterns.{name}"
+            flags = cls.parse_flags(config.get('flags'), cls.INVOICE_FLAGS, location)
+            invoice_rules.append(InvoiceRule(
+                name,
+                # Le numéro est lu dans le premier groupe
+                cls.compile_patterns(config.get('patterns', []), flags, location, min_groups=1),
+                tuple(config.get('keywords', [])),
+                config.get('max_length', 30)
+            ))
+
+        supplier = rules.get('supplier_rules', {})
+        location = 'supplier_rules.removal_patterns'
+        flags = cls.parse_flags(supplier.get('flags'), cls.REMOVAL_FLAGS, 'supplier_rules')
+        supplier_rules = SupplierRules(
+            tuple(supplier.get('company_indicators', [])),
+            tuple(
+                cls.compile_pattern(pattern, flags, f"{location}[{index}]")
+                for index, pattern in enumerate(supplier.get('removal_patterns', []))
+            )
+        )
+
+        # Toutes les dates cherchées en un seul passage, dans l'ordre des règles
+        date_scanner = DateScanner((rule, pattern) for rule in date_rules for pattern in rule.patterns)
+
+        return cls(tuple(date_rules), tuple(invoice_rules), supplier_rules, date_scanner)
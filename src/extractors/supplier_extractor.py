@@ -1,18 +1,31 @@
 import re
-import json
 import unicodedata
 from src.extractors.base_extractor import BaseExtractor
+from src.utils.config_registry import ConfigRegistry
+from src.utils.hierarchical_config import HierarchicalConfig
 
 
 class SupplierExtractor(BaseExtractor):
     """Extracteur intelligent pour identifier le fournisseur en évitant le destinataire"""
     
+    USER_PROFILE_PATH = 'src/config/user_profile.json'
+    
+    # Lignes examinées (début du document) et lignes suivantes lues pour le score
+    CANDIDATE_LINES = 30
+    FOLLOWING_LINES = 10
+    
+    # Motifs fixes compilés une fois
+    LEADING_NUMBER = re.compile(r'^\d+\s+')
+    LEGAL_MENTIONS = re.compile(r'\b(siren|siret|tva|n°tva|rcs|ape|naf|capital).*', re.IGNORECASE)
+    LEGAL_FORM = re.compile(r'\s+(sarl|sas|sa|eurl|sasu|eirl|sàrl)(\s|$)', re.IGNORECASE)
+    BULLETS = re.compile(r'[•▪►]')
+    WORD_SEPARATORS = re.compile(r'[\s\-_,\.]+')
+    
     def __init__(self, folder_name=None):
         super().__init__()
         self.folder_name = folder_name
         
         # Utiliser la config hiérarchique
-        from src.utils.hierarchical_config import HierarchicalConfig
         self.config_manager = HierarchicalConfig()
         
         # Charger la config pour ce dossier spécifique
@@ -24,23 +37,32 @@ class SupplierExtractor(BaseExtractor):
     
     def load_user_profile(self):
         """Charge le profil utilisateur pour filtrer les infos personnelles (fallback)"""
-        try:
-            with open('src/config/user_profile.json', 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            self.logger.warning(f"Profil utilisateur non trouvé: {e}")
+        profile = ConfigRegistry.get(self.USER_PROFILE_PATH)
+        if profile is None:
+            self.logger.warning(f"Profil utilisateur non trouvé: {self.USER_PROFILE_PATH}")
             return {'user_info': {}, 'extraction_zones': {}}
+        return profile
     
     def extract(self, text):
         """Extrait le nom du fournisseur en évitant le destinataire"""
+        return self.extract_with_score(text)[0]
+    
+    def extract_with_score(self, text):
+        """Extrait le fournisseur et son score: (nom, score), score 0 si inconnu"""
         lines = text.split('\n')
         candidates = []
         
+        # Mots-clés (destinataire, indicateurs, infos utilisateur) trouvés en un passage,
+        # limité aux lignes qui peuvent influencer le résultat
+        head = '\n'.join(lines[:self.CANDIDATE_LINES + self.FOLLOWING_LINES])
+        hits = self.get_keyword_automaton().find(head.lower())
+        
         # Identifier les zones à éviter (destinataire)
-        recipient_zones = self.identify_recipient_zones(lines)
+        recipient_zones = self.identify_recipient_zones(hits)
+        user_info_lines = self.find_user_info_lines(hits)
         
         # Parcourir les lignes en évitant les zones de destinataire
-        for i, line in enumerate(lines[:30]):  # Focus sur le début du document
+        for i, line in enumerate(lines[:self.CANDIDATE_LINES]):  # Focus sur le début du document
             line = line.strip()
             
             # Ignorer les lignes vides ou trop courtes
@@ -53,12 +75,12 @@ class SupplierExtractor(BaseExtractor):
                 continue
             
             # Vérifier si la ligne contient des infos utilisateur
-            if self.contains_user_info(line):
+            if i in user_info_lines:
                 self.logger.debug(f"Ligne {i} ignorée (info utilisateur): {line[:50]}")
                 continue
             
             # Calculer le score de cette ligne
-            score = self.calculate_supplier_score(line, i, lines)
+            score = self.calculate_supplier_score(line, i, lines, hits)
             
             if score > 0:
                 candidates.append({
@@ -73,28 +95,30 @@ class SupplierExtractor(BaseExtractor):
             candidates.sort(key=lambda x: x['score'], reverse=True)
             best = candidates[0]
             self.logger.info(f"Fournisseur extrait: {best['name']} (score: {best['score']:.1f})")
-            return best['name']
+            return best['name'], best['score']
         
         self.logger.warning("Aucun fournisseur identifié")
-        return "Fournisseur_Inconnu"
+        return "Fournisseur_Inconnu", 0
     
-    def identify_recipient_zones(self, lines):
+    def identify_recipient_zones(self, hits):
         """Identifie les zones contenant l'adresse du destinataire"""
-        zones = []
         recipient_keywords = self.user_profile.get('extraction_zones', {}).get('recipient_zone', {}).get('keywords', [])
         
-        for i, line in enumerate(lines):
-            line_lower = line.lower()
-            for keyword in recipient_keywords:
-                if keyword in line_lower:
-                    # Marquer une zone de 5 lignes après ce mot-clé
-                    zones.append((i, i + 5))
-                    self.logger.debug(f"Zone destinataire détectée ligne {i}: {keyword}")
-                    break
+        # Lignes contenant un mot-clé (le premier de la liste pour le journal)
+        keyword_lines = {}
+        for keyword in recipient_keywords:
+            for i in hits.lines_with(keyword):
+                keyword_lines.setdefault(i, keyword)
+        
+        zones = []
+        for i, keyword in sorted(keyword_lines.items()):
+            # Marquer une zone de 5 lignes après ce mot-clé
+            zones.append((i, i + 5))
+            self.logger.debug(f"Zone destinataire détectée ligne {i}: {keyword}")
         
         # Fusionner les zones qui se chevauchent
         merged_zones = []
-        for start, end in sorted(zones):
+        for start, end in zones:
             if merged_zones and start <= merged_zones[-1][1]:
                 merged_zones[-1] = (merged_zones[-1][0], max(end, merged_zones[-1][1]))
             else:
@@ -109,68 +133,62 @@ class SupplierExtractor(BaseExtractor):
                 return True
         return False
     
+    def get_user_terms(self):
+        """Infos utilisateur du dossier, ou du profil (fallback): minuscules → catégorie"""
+        if self.folder_name:
+            return self.config_manager.get_user_terms(self.folder_name)
+        return ConfigRegistry.derive(
+            self.USER_PROFILE_PATH, 'user_terms', self.user_profile,
+            lambda: HierarchicalConfig.build_user_terms(self.user_profile.get('user_info', {}))
+        )
+    
+    def find_user_info_lines(self, hits):
+        """Numéros des lignes contenant des informations de l'utilisateur"""
+        lines = set()
+        for term in hits.matching(self.get_user_terms()):
+            lines.update(hits.lines_with(term, stripped=True))
+        return lines
+    
     def contains_user_info(self, line):
         """
         Vérifie si la ligne contient des informations de l'utilisateur
         selon la configuration hiérarchique du dossier
         """
-        if self.folder_name and hasattr(self.config_manager, 'is_user_info'):
-            # Utiliser la nouvelle méthode hiérarchique
+        if self.folder_name:
             return self.config_manager.is_user_info(line, self.folder_name)
         
-        # Fallback sur l'ancienne méthode
-        line_lower = line.lower()
-        user_info = self.user_profile.get('user_info', {})
-        
-        # Vérifier les noms
-        for name in user_info.get('names', []):
-            if name.lower() in line_lower:
-                self.logger.debug(f"Nom utilisateur trouvé: {name}")
-                return True
-        
-        # Vérifier les adresses
-        for address in user_info.get('addresses', []):
-            if address.lower() in line_lower:
-                self.logger.debug(f"Adresse utilisateur trouvée: {address}")
-                return True
-        
-        # Vérifier les sociétés de l'utilisateur
-        for company in user_info.get('companies', []):
-            if company.lower() in line_lower:
-                self.logger.debug(f"Entreprise utilisateur trouvée: {company}")
-                return True
+        # Fallback sur le profil utilisateur
+        terms = self.get_user_terms()
+        for term in self.get_keyword_automaton().find(line.lower()).matching(terms):
+            self.logger.debug(f"{HierarchicalConfig.USER_INFO_FIELDS[terms[term]]} trouvée: {term}")
+            return True
         
         return False
     
-    def calculate_supplier_score(self, line, line_number, all_lines):
-        """Calcule le score pour identifier si c'est le fournisseur"""
+    def calculate_supplier_score(self, line, line_number, all_lines, hits):
+        """Calcule le score pour identifier si c'est le fournisseur (mots-clés lus dans hits)"""
         score = 0
-        line_lower = line.lower()
         
         # Bonus si en début de document
         if line_number < 10:
             score += 20 - line_number * 2
         
         # Bonus pour indicateurs d'entreprise
-        company_indicators = self.rules.get('supplier_rules', {}).get('company_indicators', [])
-        for indicator in company_indicators:
-            if indicator in line_lower:
-                score += 30
-                break
+        company_indicators = self.rule_set.supplier_rules.company_indicators
+        if line_number in hits.lines_with_any(company_indicators, stripped=True):
+            score += 30
         
-        # Bonus si avant les mots-clés de facture
+        # Bonus si avant les mots-clés de facture (dans les lignes suivantes)
         prefer_keywords = self.user_profile.get('extraction_zones', {}).get('supplier_zone', {}).get('prefer_before_keywords', [])
+        following_end = min(line_number + self.FOLLOWING_LINES, len(all_lines))
         for keyword in prefer_keywords:
-            # Chercher le mot-clé dans les lignes suivantes
-            for j in range(line_number + 1, min(line_number + 10, len(all_lines))):
-                if keyword in all_lines[j].lower():
-                    score += 15
-                    break
+            if hits.in_lines(keyword, line_number + 1, following_end):
+                score += 15
         
         # Pénalité pour mots-clés négatifs
         avoid_keywords = self.user_profile.get('extraction_zones', {}).get('supplier_zone', {}).get('avoid_after_keywords', [])
         for keyword in avoid_keywords:
-            if keyword in line_lower:
+            if hits.in_line(keyword, line_number, stripped=True):
                 score -= 50
         
         # Vérifier la longueur et le format
@@ -178,7 +196,7 @@ class SupplierExtractor(BaseExtractor):
             score += 10
         
         # Pénalité si ressemble à une adresse (contient des chiffres au début)
-        if re.match(r'^\d+\s+', line):
+        if self.LEADING_NUMBER.match(line):
             score -= 20
         
         return max(0, score)
@@ -186,13 +204,13 @@ class SupplierExtractor(BaseExtractor):
     def clean_supplier_name(self, text):
         """Nettoie le nom du fournisseur"""
         # Enlever les mentions légales mais garder le nom
-        text = re.sub(r'\b(siren|siret|tva|n°tva|rcs|ape|naf|capital).*', '', text, flags=re.IGNORECASE)
+        text = self.LEGAL_MENTIONS.sub('', text)
         
         # Garder le nom mais enlever le type de société à la fin
-        text = re.sub(r'\s+(sarl|sas|sa|eurl|sasu|eirl|sàrl)(\s|$)', '', text, flags=re.IGNORECASE)
+        text = self.LEGAL_FORM.sub('', text)
         
         # Enlever les caractères spéciaux excessifs
-        text = re.sub(r'[•▪►]', '', text)
+        text = self.BULLETS.sub('', text)
         
         # Limiter la longueur
         text = text.strip()[:50]
@@ -204,7 +222,7 @@ class SupplierExtractor(BaseExtractor):
         # Enlever les accents
         text = self.remove_accents(text)
         # Diviser par espaces et caractères spéciaux
-        words = re.split(r'[\s\-_,\.]+', text)
+        words = self.WORD_SEPARATORS.split(text)
         # Capitaliser et joindre
         return ''.join(word.capitalize() for word in words if word)
     
@@ -1,9 +1,216 @@
 # src/utils/concurrent_manager.py
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from src.utils.logger import Logger
+from src.utils.run_metrics import RunMetrics
+from src.utils.thread_tuner import ThreadTuner
+
+
+def _init_process_worker(config=None):
+    """Initialise un processus worker (logger et règles compilés une seule fois)"""
+    # Limite OpenMP fixée avant que le worker ne charge Tesseract
+    omp_threads = ((config or {}).get('concurrency') or {}).get('omp_thread_limit')
+    if omp_threads:
+        ThreadTuner.apply(omp_threads)
+    Logger()
+    from src.extractors.base_extractor import BaseExtractor
+    BaseExtractor.get_rule_set()
+    # Importer le contrôleur OCR configure Tesseract/Poppler dans le worker
+    from src.controllers.ocr_controller import OCRController
+    OCRController.configure(config)
+
+
+def _run_with_metrics(function, *args):
+    """Exécute une tâche dans un processus worker et renvoie aussi ses métriques"""
+    try:
+        return function(*args), RunMetrics.drain()
+    except Exception:
+        # Métriques de la tâche en échec ignorées
+        RunMetrics.drain()
+        raise
 
 
 class ConcurrentManager:
+    logger = Logger()
+
+    ENGINES = ('thread', 'process')
+    WORK_UNITS = ('page', 'file')
+
+    @staticmethod
+    def get_max_workers(max_workers=None):
+        """
+        Retourne le nombre de workers à utiliser
+        Par défaut: nombre de cœurs divisé par les threads OpenMP de Tesseract
+        """
+        if max_workers:
+            return max(1, int(max_workers))
+        return max(1, ThreadTuner.get_cpu_count() // ThreadTuner.get_omp_thread_limit())
+
     @staticmethod
-    def process_files(files, processing_function):
-        with ThreadPoolExecutor() as executor:
-            executor.map(processing_function, files)
+    def create_executor(engine='thread', max_workers=None, config=None):
+        """Crée l'exécuteur correspondant au moteur demandé"""
+        workers = ConcurrentManager.get_max_workers(max_workers)
+
+        if engine == 'process':
+            ConcurrentManager.logger.info(f"Moteur processus: {workers} worker(s)")
+            return ProcessPoolExecutor(max_workers=workers, initializer=_init_process_worker, initargs=(config,))
+
+        if engine != 'thread':
+            ConcurrentManager.logger.warning(f"Moteur inconnu '{engine}', utilisation des threads")
+
+        ConcurrentManager.logger.info(f"Moteur threads: {workers} worker(s)")
+        return ThreadPoolExecutor(max_workers=workers)
+
+    @staticmethod
+    def submit(executor, function, *args):
+        """Soumet une tâche; dans un processus worker, ses métriques reviennent avec le résultat"""
+        if isinstance(executor, ProcessPoolExecutor):
+            future = executor.submit(_run_with_metrics, function, *args)
+            future.with_metrics = True
+            return future
+        return executor.submit(function, *args)
+
+    @staticmethod
+    def get_result(future):
+        """Résultat d'une tâche soumise par submit (métriques fusionnées dans le parent)"""
+        result = future.result()
+        if getattr(future, 'with_metrics', False):
+            result, metrics = result
+            RunMetrics.merge(metrics)
+        return result
+
+    @staticmethod
+    def process_files(files, processing_function, engine='thread', max_workers=None, on_result=None, config=None):
+        """
+        Traite les fichiers en parallèle et retourne les résultats
+        on_result est appelé dans le processus parent pour chaque résultat non vide
+        config est transmis aux processus workers
+        """
+        results = []
+
+        with ConcurrentManager.create_executor(engine, max_workers, config) as executor:
+            futures = {ConcurrentManager.submit(executor, processing_function, file): file for file in files}
+
+            for future in as_completed(futures):
+                file = futures[future]
+                try:
+                    result = ConcurrentManager.get_result(future)
+                except Exception as e:
+                    ConcurrentManager.logger.error(f"Erreur lors du traitement de {file}: {e}")
+                    result = None
+
+                if result is not None and on_result:
+                    on_result(result)
+                results.append(result)
+
+        return results
+
+    @staticmethod
+    def process_pages(files, count_pages, process_window, finalize, engine='thread', max_workers=None,
+                      on_result=None, config=None, expand=None, pages_per_task=1):
+        """
+        Découpe chaque fichier en tâches de pages_per_task pages réparties sur le pool,
+        puis appelle finalize(file, page_results) avec les pages dans l'ordre
+        process_window(file, page_numbers) retourne le résultat de chaque page
+        count_pages(file) retourne le nombre de pages, ou directement la liste
+        des résultats de pages s'ils sont déjà connus (cache)
+        on_result est appelé dans le processus parent pour chaque résultat non vide
+        expand(file, page_results), si fourni, choisit les prochaines pages à traiter
+        (None pour les pages non traitées); le fichier est finalisé quand il retourne []
+        """
+        results = []
+        pending = {}
+        page_results = {}
+        remaining = {}
+        pages_per_task = max(1, int(pages_per_task))
+        # Fichiers dont une page a échoué: en échec, pas finalisés sans le texte de la page
+        failed = set()
+
+        with ConcurrentManager.create_executor(engine, max_workers, config) as executor:
+            def schedule(file):
+                """Soumet les pages suivantes du fichier, ou sa finalisation"""
+                if expand is None:
+                    page_numbers = [number for number, result in enumerate(page_results[file], 1) if result is None]
+                else:
+                    page_numbers = expand(file, page_results[file])
+
+                if not page_numbers:
+                    # Toutes les pages sont prêtes: réassembler dans l'ordre
+                    future = ConcurrentManager.submit(executor, finalize, file, page_results.pop(file))
+                    pending[future] = (file, None)
+                    return
+
+                tasks = [page_numbers[start:start + pages_per_task]
+                         for start in range(0, len(page_numbers), pages_per_task)]
+                remaining[file] = len(tasks)
+                for task in tasks:
+                    future = ConcurrentManager.submit(executor, process_window, file, task)
+                    pending[future] = (file, task)
+
+            # Compter les pages de chaque fichier
+            count_futures = {ConcurrentManager.submit(executor, count_pages, file): file for file in files}
+            page_counts = {}
+            for future in as_completed(count_futures):
+                file = count_futures[future]
+                try:
+                    page_counts[file] = ConcurrentManager.get_result(future) or 0
+                except Exception as e:
+                    ConcurrentManager.logger.error(f"Erreur lors du comptage des pages de {file}: {e}")
+                    page_counts[file] = 0
+
+            # Les plus gros documents d'abord pour limiter la traîne en fin de lot
+            ready = [file for file in files if isinstance(page_counts[file], list)]
+            for file in ready:
+                page_results[file] = page_counts.pop(file)
+                schedule(file)
+
+            for file in sorted(page_counts, key=lambda f: page_counts[f], reverse=True):
+                count = page_counts[file]
+                if count == 0:
+                    ConcurrentManager.logger.warning(f"Aucune page à traiter: {file}")
+                    results.append(None)
+                    continue
+
+                page_results[file] = [None] * count
+                schedule(file)
+
+            total_pages = sum(len(task) for _, task in pending.values() if task is not None)
+            ConcurrentManager.logger.info(f"{total_pages} page(s) réparties sur {len(remaining)} fichier(s)")
+            if ready:
+                ConcurrentManager.logger.info(f"{len(ready)} fichier(s) déjà prêts")
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file, page_numbers = pending.pop(future)
+
+                    # Tâche de finalisation (page_numbers est None)
+                    if page_numbers is None:
+                        try:
+                            result = ConcurrentManager.get_result(future)
+                        except Exception as e:
+                            ConcurrentManager.logger.error(f"Erreur lors de la finalisation de {file}: {e}")
+                            result = None
+
+                        if result is not None and on_result:
+                            on_result(result)
+                        results.append(result)
+                        continue
+
+                    try:
+                        texts = ConcurrentManager.get_result(future)
+                    except Exception as e:
+                        ConcurrentManager.logger.error(f"Erreur pages {page_numbers} de {file}: {e}")
+                        texts = [''] * len(page_numbers)
+                        failed.add(file)
+                    for page_number, text in zip(page_numbers, texts):
+                        page_results[file][page_number - 1] = text or ''
+
+                    remaining[file] -= 1
+                    if remaining[file] == 0:
+                        if file in failed:
+                            del page_results[file]
+                            results.append(None)
+                            continue
+                        schedule(file)
+
+        return results
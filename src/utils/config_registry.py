@@ -0,0 +1,124 @@
+# src/utils/config_registry.py
+import json
+import os
+import threading
+from src.utils.logger import Logger
+
+
+class FrozenDict(dict):
+    """Dictionnaire en lecture seule (règles partagées entre threads)"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Configuration en lecture seule: utiliser ConfigRegistry.thaw pour la modifier")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        # Transmis tel quel aux processus workers
+        return FrozenDict, (dict(self),)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class ConfigRegistry:
+    """
+    Fichiers de configuration JSON partagés par tout le processus
+    Chaque fichier est lu une seule fois, puis relu seulement si sa date de
+    modification ou sa taille changent. Les valeurs rendues sont figées
+    (FrozenDict, tuples): les extracteurs les partagent sans les copier
+    Chaque processus worker a son registre; la date de modification les garde cohérents
+    """
+
+    logger = Logger()
+
+    _entries = {}
+    _lock = threading.RLock()
+
+    @staticmethod
+    def freeze(value):
+        """
+        Copie figée d'une valeur JSON (dict → FrozenDict, list → tuple)
+        Les namedtuple (règles compilées...) sont déjà figés et rendus tels quels
+        """
+        if isinstance(value, dict):
+            return FrozenDict((key, ConfigRegistry.freeze(item)) for key, item in value.items())
+        if isinstance(value, list) or type(value) is tuple:
+            return tuple(ConfigRegistry.freeze(item) for item in value)
+        return value
+
+    @staticmethod
+    def thaw(value):
+        """Copie modifiable d'une valeur figée (dict et list)"""
+        if isinstance(value, dict):
+            return {key: ConfigRegistry.thaw(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [ConfigRegistry.thaw(item) for item in value]
+        return value
+
+    @staticmethod
+    def _key(path):
+        return os.path.normpath(os.path.abspath(path))
+
+    @staticmethod
+    def _stamp(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def get(path, default=None):
+        """
+        Contenu figé du fichier JSON, relu s'il a changé depuis la dernière lecture
+        default si le fichier est absent ou invalide
+        """
+        key = ConfigRegistry._key(path)
+        stamp = ConfigRegistry._stamp(path)
+        if stamp is None:
+            return default
+
+        with ConfigRegistry._lock:
+            entry = ConfigRegistry._entries.get(key)
+            if entry is not None and entry['stamp'] == stamp:
+                return entry['value']
+
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    value = ConfigRegistry.freeze(json.load(f))
+            except Exception as e:
+                ConfigRegistry.logger.error(f"Erreur chargement {path}: {e}")
+                return default
+
+            ConfigRegistry._entries[key] = {'stamp': stamp, 'value': value, 'derived': {}}
+            ConfigRegistry.logger.debug(f"Configuration chargée: {path}")
+            return value
+
+    @staticmethod
+    def derive(path, name, source, build):
+        """
+        Valeur calculée à partir du contenu du fichier (config effective d'un
+        dossier...), mémorisée tant que source est le contenu courant du fichier
+        build() est appelé sinon; le résultat est figé
+        """
+        with ConfigRegistry._lock:
+            entry = ConfigRegistry._entries.get(ConfigRegistry._key(path))
+            if entry is None or entry['value'] is not source:
+                return ConfigRegistry.freeze(build())
+            if name not in entry['derived']:
+                entry['derived'][name] = ConfigRegistry.freeze(build())
+            return entry['derived'][name]
+
+    @staticmethod
+    def invalidate(path=None):
+        """Oublie un fichier (après écriture) ou tout le registre"""
+        with ConfigRegistry._lock:
+            if path is None:
+                ConfigRegistry._entries = {}
+            else:
+                ConfigRegistry._entries.pop(ConfigRegistry._key(path), None)
@@ -1,6 +1,8 @@
 import re
 import unicodedata
 from datetime import datetime
+from src.extractors.date_scanner import DateScanner
+from src.utils.keyword_automaton import KeywordHits
 from src.utils.logger import Logger
 
 
@@ -9,8 +11,8 @@ class DocumentAnalyzer:
     
     logger = Logger()
     
-    # Patterns pour détecter les dates
-    DATE_PATTERNS = [
+    # Patterns pour détecter les dates (compilés une fois)
+    DATE_PATTERNS = [re.compile(pattern) for pattern in [
         # Format français DD/MM/YYYY ou DD-MM-YYYY
         r'\b(\d{1,2})[/-](\d{1,2})[/-](\d{4})\b',
         # Format français DD.MM.YYYY
@@ -19,7 +21,15 @@ class DocumentAnalyzer:
         r'\b(\d{1,2})\s+(janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre)\s+(\d{4})\b',
         # Format ISO YYYY-MM-DD
         r'\b(\d{4})[/-](\d{1,2})[/-](\d{1,2})\b',
-    ]
+    ]]
+    
+    # Numéro après un mot-clé, et caractères retirés des parties du nom de fichier
+    INVOICE_NUMBER_PATTERN = re.compile(r'[\s:]*([A-Z0-9\-/]+)', re.IGNORECASE)
+    NON_FILENAME_CHARS = re.compile(r'[^\w\-]')
+    WORD_SEPARATORS = re.compile(r'[\s_\-]+')
+    
+    # Tous les patterns de dates en un seul passage
+    DATE_SCANNER = DateScanner((None, pattern) for pattern in DATE_PATTERNS)
     
     # Mots-clés pour identifier les dates importantes
     DATE_KEYWORDS = ['date', 'le', 'émise', 'facture du', 'document du', 'établi', 'échéance']
@@ -43,37 +53,39 @@ class DocumentAnalyzer:
     @staticmethod
     def extract_date(text):
         """Extrait la date la plus probable du document"""
+        return DocumentAnalyzer.extract_date_with_score(text)[0]
+    
+    @staticmethod
+    def extract_date_with_score(text):
+        """Extrait la date la plus probable et son score: (date, score) ou (None, 0)"""
         text_lower = text.lower()
         found_dates = []
+        hits = KeywordHits.search(text_lower)
         
-        # Chercher toutes les dates dans le texte
-        for pattern in DocumentAnalyzer.DATE_PATTERNS:
-            matches = re.finditer(pattern, text_lower)
-            for match in matches:
-                # Calculer un score basé sur la proximité avec des mots-clés
-                position = match.start()
-                score = 0
-                
-                # Vérifier la proximité avec les mots-clés
-                for keyword in DocumentAnalyzer.DATE_KEYWORDS:
-                    keyword_pos = text_lower.rfind(keyword, max(0, position - 50), position)
-                    if keyword_pos != -1:
-                        score += 50 - (position - keyword_pos)
-                
-                found_dates.append((match, score))
+        # Chercher toutes les dates dans le texte (un seul passage)
+        for order, _, match, groups in DocumentAnalyzer.DATE_SCANNER.scan(text_lower):
+            # Calculer un score basé sur la proximité avec des mots-clés
+            position = match.start()
+            score = 0
+            
+            # Vérifier la proximité avec les mots-clés
+            for keyword in DocumentAnalyzer.DATE_KEYWORDS:
+                keyword_pos = hits.last_before(keyword, position, 50)
+                if keyword_pos != -1:
+                    score += 50 - (position - keyword_pos)
+            
+            found_dates.append((groups, score, order))
         
         if not found_dates:
             DocumentAnalyzer.logger.debug("Aucune date trouvée dans le document")
-            return None
+            return None, 0
         
-        # Trier par score et prendre la meilleure
-        found_dates.sort(key=lambda x: x[1], reverse=True)
-        best_match = found_dates[0][0]
+        # Trier par score et prendre la meilleure (à égalité: ordre des patterns, puis du texte)
+        found_dates.sort(key=lambda x: (-x[1], x[2]))
+        groups, best_score, _ = found_dates[0]
         
         # Parser la date selon le format
         try:
-            groups = best_match.groups()
-            
             # Format avec mois en texte
             if len(groups) == 3 and groups[1] in DocumentAnalyzer.MONTHS:
                 day = groups[0].zfill(2)
@@ -92,11 +104,11 @@ class DocumentAnalyzer:
             
             date_str = f"{year}{month}{day}"
             DocumentAnalyzer.logger.debug(f"Date extraite: {date_str}")
-            return date_str
+            return date_str, best_score
             
         except Exception as e:
             DocumentAnalyzer.logger.error(f"Erreur lors du parsing de la date: {e}")
-            return None
+            return None, 0
     
     @staticmethod
     def extract_invoice_number(text):
@@ -111,11 +123,11 @@ class DocumentAnalyzer:
                 after_keyword = text[pos + len(keyword):pos + len(keyword) + 50]
                 
                 # Chercher un numéro (lettres et chiffres)
-                match = re.search(r'[\s:]*([A-Z0-9\-/]+)', after_keyword, re.IGNORECASE)
+                match = DocumentAnalyzer.INVOICE_NUMBER_PATTERN.search(after_keyword)
                 if match:
                     invoice_num = match.group(1).strip()
                     # Nettoyer le numéro
-                    invoice_num = re.sub(r'[^\w\-]', '', invoice_num)
+                    invoice_num = DocumentAnalyzer.NON_FILENAME_CHARS.sub('', invoice_num)
                     if invoice_num:
                         DocumentAnalyzer.logger.debug(f"Numéro de facture extrait: {invoice_num}")
                         return invoice_num
@@ -126,10 +138,36 @@ class DocumentAnalyzer:
     @staticmethod
     def extract_supplier(text, folder_name=None):
         """Extrait le nom du fournisseur selon le dossier"""
+        return DocumentAnalyzer.extract_supplier_with_score(text, folder_name)[0]
+    
+    @staticmethod
+    def extract_supplier_with_score(text, folder_name=None):
+        """Extrait le fournisseur et son score: (nom, score)"""
         # Utiliser l'extracteur intelligent avec le nom du dossier
         from src.extractors.supplier_extractor import SupplierExtractor
         extractor = SupplierExtractor(folder_name=folder_name)
-        return extractor.extract(text)
+        return extractor.extract_with_score(text)
+    
+    @staticmethod
+    def extract_metadata(text, folder_name=None):
+        """
+        Extrait date, fournisseur et numéro avec leurs scores de confiance
+        Les valeurs non trouvées valent None (score 0)
+        """
+        date, date_score = DocumentAnalyzer.extract_date_with_score(text)
+        supplier, supplier_score = DocumentAnalyzer.extract_supplier_with_score(text, folder_name)
+        invoice_num = DocumentAnalyzer.extract_invoice_number(text)
+        
+        return {
+            'date': date,
+            'supplier': supplier if supplier_score > 0 else None,
+            'invoice': invoice_num,
+            'scores': {
+                'date': date_score if date else 0,
+                'supplier': supplier_score,
+                'invoice': 100 if invoice_num else 0
+            }
+        }
     
     @staticmethod  
     def extract_supplier_legacy(text):
@@ -185,7 +223,7 @@ class DocumentAnalyzer:
         # Enlever les accents d'abord
         text = DocumentAnalyzer.remove_accents(text)
         # Diviser par espaces, underscores, tirets
-        words = re.split(r'[\s_\-]+', text)
+        words = DocumentAnalyzer.WORD_SEPARATORS.split(text)
         # Capitaliser chaque mot et joindre
         camel = ''.join(word.capitalize() for word in words if word)
         return camel
@@ -212,6 +250,14 @@ class DocumentAnalyzer:
         Génère un nom de fichier intelligent basé sur le contenu OCR
         Format: YYYYMMDD_Fournisseur_NumeroFacture.pdf
         """
+        return DocumentAnalyzer.analyze_document(text, original_filename, folder_name)['filename']
+    
+    @staticmethod
+    def analyze_document(text, original_filename=None, folder_name=None):
+        """
+        Extrait les métadonnées du document et le nom de fichier généré
+        Retourne un dict: date, supplier, invoice, filename
+        """
         # Extraire les métadonnées avec contexte de dossier
         date = DocumentAnalyzer.extract_date(text)
         supplier = DocumentAnalyzer.extract_supplier(text, folder_name=folder_name)
@@ -234,7 +280,7 @@ class DocumentAnalyzer:
         if invoice_num:
             # Pour les numéros, garder le format original mais nettoyer
             invoice_clean = DocumentAnalyzer.remove_accents(invoice_num)
-            invoice_clean = re.sub(r'[^\w\-]', '', invoice_clean)
+            invoice_clean = DocumentAnalyzer.NON_FILENAME_CHARS.sub('', invoice_clean)
             if invoice_clean:
                 parts.append(invoice_clean)
         
@@ -246,4 +292,9 @@ class DocumentAnalyzer:
         filename = '_'.join(parts) + '.pdf'
         
         DocumentAnalyzer.logger.info(f"Nom de fichier généré: {filename}")
-        return filename
\ No newline at end of file
+        return {
+            'date': date,
+            'supplier': supplier,
+            'invoice': invoice_num,
+            'filename': filename
+        }
\ No newline at end of file
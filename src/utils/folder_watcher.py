@@ -0,0 +1,176 @@
+# src/utils/folder_watcher.py
+import ctypes
+import ctypes.util
+import os
+import platform
+import select
+import struct
+from src.utils.logger import Logger
+
+
+class FolderWatcher:
+    """
+    Surveille des dossiers et signale les nouveaux fichiers dès qu'ils sont complets
+    inotify sous Linux, sinon scrutation périodique (fichier stable entre deux passages)
+    """
+
+    # Constantes inotify (linux/inotify.h)
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_ISDIR = 0x40000000
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self, folder_paths, file_extensions=('.pdf',), poll_interval=5, use_inotify=True):
+        self.logger = Logger()
+        self.folder_paths = list(folder_paths)
+        self.file_extensions = tuple(ext.lower() for ext in file_extensions)
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify and platform.system() == 'Linux'
+
+    def is_watched_file(self, file_path):
+        return file_path.lower().endswith(self.file_extensions)
+
+    def watch(self, stop_event, include_existing=False):
+        """
+        Générateur des chemins de fichiers nouveaux ou modifiés jusqu'à stop_event
+        include_existing: signale d'abord les fichiers déjà présents, une fois la
+        surveillance en place (aucun fichier déposé entre les deux n'est perdu)
+        """
+        if self.use_inotify:
+            libc = self._load_libc()
+            if libc is not None:
+                self.logger.info("Surveillance des dossiers via inotify")
+                yield from self._watch_inotify(libc, stop_event, include_existing)
+                return
+            self.logger.warning("inotify indisponible, passage en scrutation périodique")
+
+        self.logger.info(f"Surveillance des dossiers par scrutation ({self.poll_interval}s)")
+        yield from self._watch_polling(stop_event, include_existing)
+
+    @staticmethod
+    def _load_libc():
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            libc.inotify_init1
+            return libc
+        except (OSError, AttributeError):
+            return None
+
+    def _watch_inotify(self, libc, stop_event, include_existing=False):
+        fd = libc.inotify_init1(os.O_NONBLOCK)
+        if fd < 0:
+            self.logger.error(f"inotify_init1 a échoué (errno {ctypes.get_errno()})")
+            yield from self._watch_polling(stop_event, include_existing)
+            return
+
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE_SELF
+        watches = {}
+
+        def add_watch(directory):
+            wd = libc.inotify_add_watch(fd, os.fsencode(directory), mask)
+            if wd < 0:
+                self.logger.warning(f"Impossible de surveiller {directory} (errno {ctypes.get_errno()})")
+                return
+            watches[wd] = directory
+
+        def add_tree(directory):
+            for subdir, _, _ in os.walk(directory):
+                add_watch(subdir)
+
+        try:
+            for folder_path in self.folder_paths:
+                os.makedirs(folder_path, exist_ok=True)
+                add_tree(folder_path)
+
+            # Fichiers présents avant la surveillance (les événements suivants sont en file)
+            if include_existing:
+                for folder_path in self.folder_paths:
+                    yield from self._list_files(folder_path)
+
+            while not stop_event.is_set():
+                ready, _, _ = select.select([fd], [], [], 1.0)
+                if not ready:
+                    continue
+
+                try:
+                    data = os.read(fd, 64 * 1024)
+                except BlockingIOError:
+                    continue
+
+                offset = 0
+                while offset < len(data):
+                    wd, event_mask, _, name_length = self.EVENT_HEADER.unpack_from(data, offset)
+                    offset += self.EVENT_HEADER.size
+                    name = os.fsdecode(data[offset:offset + name_length].rstrip(b'\0'))
+                    offset += name_length
+
+                    if event_mask & self.IN_Q_OVERFLOW:
+                        # Événements perdus: rescanner les dossiers
+                        self.logger.warning("File inotify saturée, rescan des dossiers")
+                        for folder_path in self.folder_paths:
+                            yield from self._list_files(folder_path)
+                        continue
+
+                    directory = watches.get(wd)
+                    if directory is None:
+                        continue
+
+                    if event_mask & self.IN_DELETE_SELF:
+                        watches.pop(wd, None)
+                        continue
+
+                    path = os.path.join(directory, name)
+                    if event_mask & self.IN_ISDIR:
+                        if event_mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                            add_tree(path)
+                            yield from self._list_files(path)
+                        continue
+
+                    # IN_CREATE seul: attendre la fin de l'écriture (IN_CLOSE_WRITE)
+                    if event_mask & (self.IN_CLOSE_WRITE | self.IN_MOVED_TO) and self.is_watched_file(path):
+                        yield path
+        finally:
+            os.close(fd)
+
+    def _list_files(self, folder_path):
+        for subdir, _, files in os.walk(folder_path):
+            for file in files:
+                path = os.path.join(subdir, file)
+                if self.is_watched_file(path):
+                    yield path
+
+    def _watch_polling(self, stop_event, include_existing=False):
+        # Fichiers présents au démarrage: signalés une seule fois (include_existing)
+        # ou déjà pris en charge par l'appelant
+        known = {}
+        for folder_path in self.folder_paths:
+            for path in self._list_files(folder_path):
+                known[path] = self._signature(path)
+        reported = dict(known)
+        if include_existing:
+            yield from known
+
+        while not stop_event.wait(self.poll_interval):
+            current = {}
+            for folder_path in self.folder_paths:
+                for path in self._list_files(folder_path):
+                    current[path] = self._signature(path)
+
+            for path, signature in current.items():
+                # Fichier stable depuis le passage précédent et pas encore signalé
+                if signature is not None and known.get(path) == signature and reported.get(path) != signature:
+                    reported[path] = signature
+                    yield path
+
+            known = current
+
+    @staticmethod
+    def _signature(path):
+        try:
+            stat = os.stat(path)
+            return stat.st_size, stat.st_mtime
+        except OSError:
+            return None
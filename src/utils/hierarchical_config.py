@@ -1,31 +1,40 @@
 import json
 import os
 from copy import deepcopy
+from src.utils.config_registry import ConfigRegistry
 from src.utils.logger import Logger
 
 
 class HierarchicalConfig:
-    """Gestionnaire de configuration hiérarchique avec héritage et surcharges"""
+    """
+    Gestionnaire de configuration hiérarchique avec héritage et surcharges
+    La configuration est lue via ConfigRegistry: figée et partagée par toutes
+    les instances, relue seulement si le fichier change
+    """
+    
+    CONFIG_FILE = 'src/config/hierarchical_config.json'
+    
+    # Catégories d'infos utilisateur, dans l'ordre de vérification
+    USER_INFO_FIELDS = {'names': "Info utilisateur", 'addresses': "Adresse utilisateur",
+                        'companies': "Entreprise utilisateur"}
     
     def __init__(self):
         self.logger = Logger()
-        self.config_file = 'src/config/hierarchical_config.json'
+        self.config_file = self.CONFIG_FILE
         self.config = self.load_config()
     
     def load_config(self):
-        """Charge la configuration hiérarchique"""
+        """Charge la configuration hiérarchique (lecture seule)"""
         if not os.path.exists(self.config_file):
             # Créer une config par défaut
-            default = self.create_default_config()
-            self.save_config(default)
-            return default
+            self.save_config(self.create_default_config())
+            return self.config
         
-        try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except Exception as e:
-            self.logger.error(f"Erreur chargement config hiérarchique: {e}")
-            return self.create_default_config()
+        config = ConfigRegistry.get(self.config_file)
+        if config is None:
+            self.logger.error("Erreur chargement config hiérarchique, configuration par défaut utilisée")
+            return ConfigRegistry.freeze(self.create_default_config())
+        return config
     
     def create_default_config(self):
         """Crée une configuration par défaut"""
@@ -45,7 +54,7 @@ class HierarchicalConfig:
         }
     
     def save_config(self, config=None):
-        """Sauvegarde la configuration"""
+        """Sauvegarde la configuration et la recharge dans le registre"""
         if config is None:
             config = self.config
         
@@ -53,20 +62,30 @@ class HierarchicalConfig:
         with open(self.config_file, 'w', encoding='utf-8') as f:
             json.dump(config, f, indent=2, ensure_ascii=False)
         
+        ConfigRegistry.invalidate(self.config_file)
+        self.config = ConfigRegistry.get(self.config_file, ConfigRegistry.freeze(config))
         self.logger.info("Configuration hiérarchique sauvegardée")
     
     def get_folder_config(self, folder_name):
         """
         Retourne la configuration effective pour un dossier
         en appliquant l'héritage et les surcharges
+        Calculée une fois par version du fichier, en lecture seule
         """
+        return ConfigRegistry.derive(
+            self.config_file, ('folder', folder_name), self.config,
+            lambda: self._build_folder_config(folder_name)
+        )
+    
+    def _build_folder_config(self, folder_name):
+        config = ConfigRegistry.thaw(self.config)
         
         # Commencer avec la config globale
-        effective_config = deepcopy(self.config.get('global', {}))
+        effective_config = deepcopy(config.get('global', {}))
         
         # Si le dossier a une config spécifique
-        if folder_name in self.config.get('folders', {}):
-            folder_config = self.config['folders'][folder_name]
+        if folder_name in config.get('folders', {}):
+            folder_config = config['folders'][folder_name]
             
             # Appliquer les ajouts
             if 'add' in folder_config:
@@ -131,41 +150,64 @@ class HierarchicalConfig:
         
         return result
     
+    @staticmethod
+    def build_user_terms(user_info):
+        """Noms, adresses et entreprises en minuscules → catégorie"""
+        terms = {}
+        for field in HierarchicalConfig.USER_INFO_FIELDS:
+            for value in user_info.get(field, []):
+                terms.setdefault(value.lower(), field)
+        return terms
+    
+    @staticmethod
+    def collect_section_keywords(section):
+        """Mots-clés d'une section (globale, ajouts d'un dossier, profil) pour l'automate"""
+        keywords = list(HierarchicalConfig.build_user_terms(section.get('user_info', {})))
+        zones = section.get('extraction_zones', {})
+        keywords.extend(zones.get('recipient_zone', {}).get('keywords', []))
+        supplier_zone = zones.get('supplier_zone', {})
+        keywords.extend(supplier_zone.get('prefer_before_keywords', []))
+        keywords.extend(supplier_zone.get('avoid_after_keywords', []))
+        return keywords
+    
+    @staticmethod
+    def collect_keywords(config):
+        """Mots-clés de la config globale et des ajouts de tous les dossiers"""
+        keywords = HierarchicalConfig.collect_section_keywords(config.get('global', {}))
+        for folder_config in config.get('folders', {}).values():
+            keywords.extend(HierarchicalConfig.collect_section_keywords(folder_config.get('add', {})))
+        return keywords
+    
+    def get_user_terms(self, folder_name):
+        """Infos utilisateur effectives du dossier (minuscules → catégorie), en lecture seule"""
+        return ConfigRegistry.derive(
+            self.config_file, ('user_terms', folder_name), self.config,
+            lambda: self.build_user_terms(self.get_folder_config(folder_name).get('user_info', {}))
+        )
+    
     def is_user_info(self, text, folder_name):
         """
         Vérifie si le texte contient des infos utilisateur
-        pour le dossier spécifié
+        pour le dossier spécifié (un passage de l'automate des mots-clés)
         """
-        config = self.get_folder_config(folder_name)
-        user_info = config.get('user_info', {})
-        
-        text_lower = text.lower()
-        
-        # Vérifier les noms
-        for name in user_info.get('names', []):
-            if name.lower() in text_lower:
-                self.logger.debug(f"Info utilisateur trouvée dans {folder_name}: {name}")
-                return True
-        
-        # Vérifier les adresses
-        for address in user_info.get('addresses', []):
-            if address.lower() in text_lower:
-                self.logger.debug(f"Adresse utilisateur trouvée dans {folder_name}: {address}")
-                return True
+        from src.extractors.base_extractor import BaseExtractor
+        terms = self.get_user_terms(folder_name)
+        if not terms:
+            return False
         
-        # Vérifier les entreprises
-        for company in user_info.get('companies', []):
-            if company.lower() in text_lower:
-                self.logger.debug(f"Entreprise utilisateur trouvée dans {folder_name}: {company}")
-                return True
+        hits = BaseExtractor.get_keyword_automaton().find(text.lower())
+        for term in hits.matching(terms):
+            self.logger.debug(f"{self.USER_INFO_FIELDS[terms[term]]} trouvée dans {folder_name}: {term}")
+            return True
         
         return False
     
     def add_folder_config(self, folder_name, description="", add_config=None, remove_config=None):
         """Ajoute ou met à jour la configuration d'un dossier"""
+        config = ConfigRegistry.thaw(self.config)
         
-        if 'folders' not in self.config:
-            self.config['folders'] = {}
+        if 'folders' not in config:
+            config['folders'] = {}
         
         folder_config = {
             "description": description,
@@ -173,22 +215,23 @@ class HierarchicalConfig:
             "remove": remove_config or {}
         }
         
-        self.config['folders'][folder_name] = folder_config
-        self.save_config()
+        config['folders'][folder_name] = folder_config
+        self.save_config(config)
         
         self.logger.info(f"Configuration ajoutée pour le dossier: {folder_name}")
     
     def update_global_config(self, user_info=None, supplier_mappings=None):
         """Met à jour la configuration globale"""
+        config = ConfigRegistry.thaw(self.config)
         
-        if 'global' not in self.config:
-            self.config['global'] = self.create_default_config()['global']
+        if 'global' not in config:
+            config['global'] = self.create_default_config()['global']
         
         if user_info:
-            self.config['global']['user_info'].update(user_info)
+            config['global']['user_info'].update(user_info)
         
         if supplier_mappings:
-            self.config['global']['supplier_mappings'].update(supplier_mappings)
+            config['global']['supplier_mappings'].update(supplier_mappings)
         
-        self.save_config()
+        self.save_config(config)
         self.logger.info("Configuration globale mise à jour")
\ No newline at end of file
@@ -0,0 +1,104 @@
+# src/utils/image_preprocessor.py
+import cv2
+import numpy as np
+from PIL import Image
+from src.utils.logger import Logger
+
+
+class ImagePreprocessor:
+    """
+    Prépare les pages rastérisées pour Tesseract (vectorisé avec OpenCV/NumPy):
+    niveaux de gris, seuillage adaptatif, recadrage des marges, réduction
+    """
+
+    logger = Logger()
+
+    DEFAULTS = {
+        'grayscale': True,
+        'threshold': True,
+        'block_size': 31,
+        'offset': 15,
+        'crop_margins': True,
+        'margin': 10,
+        'max_width': None
+    }
+
+    @staticmethod
+    def get_settings(settings=None):
+        """Réglages effectifs (section preprocess de config.json)"""
+        return dict(ImagePreprocessor.DEFAULTS, **(settings or {}))
+
+    @staticmethod
+    def preprocess(image, settings=None):
+        """Retourne une nouvelle image PIL prétraitée"""
+        settings = ImagePreprocessor.get_settings(settings)
+
+        if image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        array = np.asarray(image)
+
+        if array.ndim == 3 and (settings['grayscale'] or settings['threshold']):
+            array = cv2.cvtColor(array, cv2.COLOR_RGB2GRAY)
+
+        # Réduction avant seuillage: moins de pixels à traiter ensuite
+        max_width = settings['max_width']
+        if max_width and array.shape[1] > max_width:
+            scale = max_width / array.shape[1]
+            size = (int(max_width), max(1, int(array.shape[0] * scale)))
+            array = cv2.resize(array, size, interpolation=cv2.INTER_AREA)
+
+        if settings['threshold'] and array.ndim == 2:
+            # Taille de voisinage impaire et > 1 exigée par OpenCV
+            block_size = max(3, int(settings['block_size']) | 1)
+            array = cv2.adaptiveThreshold(
+                array, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY,
+                block_size, settings['offset']
+            )
+
+        if settings['crop_margins']:
+            array = ImagePreprocessor.crop_margins(array, settings['margin'])
+
+        return Image.fromarray(array)
+
+    @staticmethod
+    def crop_margins(array, margin=10):
+        """Recadre sur la zone encrée (bordures et marges blanches supprimées)"""
+        gray = array if array.ndim == 2 else array.min(axis=2)
+        ink = gray < 128
+        rows = np.flatnonzero(ink.any(axis=1))
+        columns = np.flatnonzero(ink.any(axis=0))
+        if rows.size == 0 or columns.size == 0:
+            # Page sans encre: rien à recadrer
+            return array
+
+        height, width = gray.shape
+        top = max(0, rows[0] - margin)
+        bottom = min(height, rows[-1] + margin + 1)
+        left = max(0, columns[0] - margin)
+        right = min(width, columns[-1] + margin + 1)
+        return np.ascontiguousarray(array[top:bottom, left:right])
+
+    @staticmethod
+    def is_blank(image, max_ink_ratio=0.0005, dark_level=160, border=0.05):
+        """
+        Vrai si la page est blanche ou presque (verso vide d'un scan recto-verso)
+        Proportion de pixels sombres mesurée hors bordures (ombres du scanner)
+        image: image PIL ou chemin d'un fichier image (lu directement par OpenCV)
+        """
+        # Sous-échantillonnage: une estimation de la couverture suffit
+        if isinstance(image, str):
+            gray = cv2.imread(image, cv2.IMREAD_REDUCED_GRAYSCALE_2)
+            if gray is None:
+                ImagePreprocessor.logger.warning(f"Image illisible: {image}")
+                return False
+        else:
+            gray = np.asarray(image if image.mode == 'L' else image.convert('L'))[::2, ::2]
+
+        height, width = gray.shape
+        top, left = int(height * border), int(width * border)
+        center = gray[top:height - top or None, left:width - left or None]
+        if center.size == 0:
+            return True
+
+        ink_ratio = np.count_nonzero(center < dark_level) / center.size
+        return ink_ratio < max_ink_ratio
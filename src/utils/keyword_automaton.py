@@ -0,0 +1,207 @@
+# src/utils/keyword_automaton.py
+import re
+from bisect import bisect_left, bisect_right
+
+try:
+    import ahocorasick
+except ImportError:
+    # pyahocorasick facultatif: repli sur une expression régulière en arbre
+    ahocorasick = None
+
+
+class KeywordHits:
+    """
+    Occurrences des mots-clés dans un texte en minuscules
+    positions: {mot-clé: [débuts croissants]}; un mot-clé absent de l'automate
+    (sans automate: tous) est cherché directement au premier appel, le résultat reste exact
+    """
+
+    def __init__(self, text, positions=None, automaton=None):
+        self.text = text
+        self.positions = {} if positions is None else positions
+        self.automaton = automaton
+        self._lines = None
+        self._line_numbers = {}
+
+    @classmethod
+    def search(cls, text_lower):
+        """
+        Occurrences cherchées à la demande avec str.find, sans automate:
+        moins coûteux qu'un passage sur tout le texte pour quelques mots-clés
+        """
+        return cls(text_lower)
+
+    def get_positions(self, keyword):
+        """Débuts de toutes les occurrences (chevauchantes) du mot-clé"""
+        positions = self.positions.get(keyword)
+        if positions is None:
+            positions = []
+            if self.automaton is None or keyword not in self.automaton.keywords:
+                position = self.text.find(keyword)
+                while position != -1:
+                    positions.append(position)
+                    position = self.text.find(keyword, position + 1)
+            self.positions[keyword] = positions
+        return positions
+
+    def first(self, keyword):
+        """Première occurrence, comme text.find(keyword)"""
+        positions = self.get_positions(keyword)
+        return positions[0] if positions else -1
+
+    def last_before(self, keyword, position, window):
+        """
+        Début de la dernière occurrence finissant avant position et commençant
+        au plus window caractères avant (-1 sinon), comme text.rfind(keyword, position - window, position)
+        """
+        positions = self.get_positions(keyword)
+        if not positions:
+            return -1
+        index = bisect_right(positions, position - len(keyword)) - 1
+        if index >= 0 and positions[index] >= max(0, position - window):
+            return positions[index]
+        return -1
+
+    def matching(self, keywords):
+        """Mots-clés de la collection (figée) présents dans le texte"""
+        found = [keyword for keyword, positions in self.positions.items() if positions and keyword in keywords]
+        missing = keywords if self.automaton is None else self.automaton.get_missing(keywords)
+        found.extend(keyword for keyword in missing if self.get_positions(keyword))
+        return list(dict.fromkeys(found))
+
+    def _get_lines(self):
+        """Début de chaque ligne et ses bornes, avec et sans les espaces aux extrémités"""
+        if self._lines is None:
+            starts = []
+            spans = []
+            start = 0
+            for line in self.text.split('\n'):
+                end = start + len(line)
+                content_start = start + len(line) - len(line.lstrip())
+                starts.append(start)
+                spans.append((start, end, content_start, max(content_start, start + len(line.rstrip()))))
+                start = end + 1
+            self._lines = (starts, spans)
+        return self._lines
+
+    def lines_with(self, keyword, stripped=False):
+        """
+        Numéros des lignes contenant le mot-clé, comme keyword in line
+        stripped: dans line.strip()
+        """
+        key = (keyword, stripped)
+        numbers = self._line_numbers.get(key)
+        if numbers is None:
+            starts, spans = self._get_lines()
+            numbers = []
+            for position in self.get_positions(keyword):
+                number = bisect_right(starts, position) - 1
+                start, end, content_start, content_end = spans[number]
+                if stripped:
+                    start, end = content_start, content_end
+                if start <= position and position + len(keyword) <= end and (not numbers or numbers[-1] != number):
+                    numbers.append(number)
+            self._line_numbers[key] = numbers
+        return numbers
+
+    def lines_with_any(self, keywords, stripped=False):
+        """Numéros des lignes contenant au moins un des mots-clés (collection figée, mémorisé)"""
+        key = (keywords, stripped)
+        numbers = self._line_numbers.get(key)
+        if numbers is None:
+            numbers = frozenset(number for keyword in keywords for number in self.lines_with(keyword, stripped))
+            self._line_numbers[key] = numbers
+        return numbers
+
+    def in_lines(self, keyword, first, last, stripped=False):
+        """Vrai si une des lignes first à last (exclue) contient le mot-clé"""
+        numbers = self.lines_with(keyword, stripped)
+        index = bisect_left(numbers, first)
+        return index < len(numbers) and numbers[index] < last
+
+    def in_line(self, keyword, number, stripped=False):
+        """Vrai si la ligne contient le mot-clé"""
+        return self.in_lines(keyword, number, number + 1, stripped)
+
+
+class KeywordAutomaton:
+    """
+    Recherche de tous les mots-clés en un seul passage sur le texte
+    Automate d'Aho-Corasick de pyahocorasick s'il est installé; sinon expression
+    régulière en arbre de préfixes: à chaque position, le plus long mot-clé
+    trouvé donne aussi ceux qui en sont des préfixes
+    """
+
+    def __init__(self, keywords):
+        # La chaîne vide n'est pas dans l'automate (cherchée directement si besoin)
+        self.keywords = frozenset(keyword for keyword in keywords if keyword)
+        self._missing = {}
+        self._automaton = None
+        self._pattern = None
+        self._prefixes = {}
+
+        if not self.keywords:
+            return
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+        else:
+            self._pattern, self._prefixes = KeywordAutomaton.build_pattern(self.keywords)
+
+    @staticmethod
+    def build_pattern(keywords):
+        """Expression régulière du plus long mot-clé à chaque position, et préfixes de chaque mot-clé"""
+        trie = {}
+        for keyword in keywords:
+            node = trie
+            for character in keyword:
+                node = node.setdefault(character, {})
+            node[''] = True
+
+        first_characters = ''.join(sorted(trie))
+        # Le premier caractère est consommé (recherche rapide par classe de caractères),
+        # l'arbre est relu depuis ce caractère: une correspondance par position
+        pattern = re.compile(
+            f"[{re.escape(first_characters)}](?<=(?=({KeywordAutomaton._trie_source(trie)})).)",
+            re.DOTALL
+        )
+        prefixes = {
+            keyword: tuple(keyword[:length] for length in range(1, len(keyword) + 1) if keyword[:length] in keywords)
+            for keyword in keywords
+        }
+        return pattern, prefixes
+
+    @staticmethod
+    def _trie_source(node):
+        branches = [re.escape(character) + KeywordAutomaton._trie_source(child)
+                    for character, child in sorted(node.items()) if character]
+        if not branches:
+            return ''
+        source = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        # Fin d'un mot-clé: la suite est facultative (gourmande, le plus long d'abord)
+        return f"(?:{source})?" if '' in node else source
+
+    def find(self, text_lower):
+        """Occurrences de tous les mots-clés dans un texte déjà en minuscules"""
+        positions = {}
+        if self._automaton is not None:
+            for end, keyword in self._automaton.iter(text_lower):
+                positions.setdefault(keyword, []).append(end - len(keyword) + 1)
+        elif self._pattern is not None:
+            for match in self._pattern.finditer(text_lower):
+                start = match.start()
+                for keyword in self._prefixes[match.group(1)]:
+                    positions.setdefault(keyword, []).append(start)
+        return KeywordHits(text_lower, positions, self)
+
+    def get_missing(self, keywords):
+        """Mots-clés d'une collection figée absents de l'automate (mémorisé par collection)"""
+        entry = self._missing.get(id(keywords))
+        if entry is None or entry[0] is not keywords:
+            if len(self._missing) > 256:
+                self._missing = {}
+            entry = (keywords, tuple(keyword for keyword in keywords if keyword not in self.keywords))
+            self._missing[id(keywords)] = entry
+        return entry[1]
@@ -6,6 +6,9 @@ from datetime import datetime
 class Logger:
     _instance = None
     
+    # Variable d'environnement partagée avec les processus workers
+    LOG_FILE_ENV = 'OCR_ASSISTANT_LOG_FILE'
+    
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
@@ -26,8 +29,12 @@ class Logger:
         console_format = logging.Formatter('%(levelname)s - %(message)s')
         console_handler.setFormatter(console_format)
         
-        # File handler
-        log_filename = f"logs/ocr_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        # File handler (les processus workers écrivent dans le fichier du parent)
+        log_filename = os.environ.get(self.LOG_FILE_ENV)
+        if not log_filename:
+            log_filename = f"logs/ocr_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+            os.environ[self.LOG_FILE_ENV] = log_filename
+        self.log_filename = log_filename
         file_handler = logging.FileHandler(log_filename, encoding='utf-8')
         file_handler.setLevel(logging.DEBUG)
         file_format = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -0,0 +1,153 @@
+# src/utils/ocr_cache.py
+import hashlib
+import json
+import os
+import threading
+from src.utils.logger import Logger
+
+
+class OCRCache:
+    """
+    Cache disque du texte OCR, indexé par le contenu du PDF
+    La clé combine le hash du fichier et la signature OCR (version de Tesseract,
+    langue, DPI...). Taille plafonnée avec éviction LRU (date d'accès = mtime)
+    """
+
+    # Parcours complet du cache pour recaler la taille estimée (autres processus)
+    RESCAN_INTERVAL = 200
+
+    def __init__(self, cache_dir='cache/ocr', max_size_mb=500):
+        self.logger = Logger()
+        self.cache_dir = cache_dir
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self._hashes = {}
+        self._lock = threading.Lock()
+        # Taille estimée (None: inconnue jusqu'au premier parcours)
+        self._total_size = None
+        self._puts = 0
+
+    def file_hash(self, file_path):
+        """Hash SHA-256 du contenu (mémorisé par chemin, taille et date de modification)"""
+        stat = os.stat(file_path)
+        memo_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+        if memo_key in self._hashes:
+            return self._hashes[memo_key]
+
+        digest = self.hash_file(file_path)
+        self._hashes[memo_key] = digest
+        return digest
+
+    @staticmethod
+    def hash_file(file_path):
+        """Hash SHA-256 du contenu d'un fichier"""
+        sha = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(chunk)
+        return sha.hexdigest()
+
+    def get_key(self, file_path, signature):
+        """Clé de cache: contenu du fichier + signature OCR"""
+        payload = json.dumps(signature, sort_keys=True)
+        return hashlib.sha256(f"{self.file_hash(file_path)}:{payload}".encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, file_path, signature):
+        """Retourne le texte des pages en cache ou None"""
+        try:
+            entry_path = self._entry_path(self.get_key(file_path, signature))
+            if not os.path.exists(entry_path):
+                return None
+
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                page_texts = json.load(f)['pages']
+
+            # Marquer l'entrée comme récemment utilisée
+            os.utime(entry_path)
+            self.logger.debug(f"Cache OCR trouvé pour {file_path}")
+            return page_texts
+        except Exception as e:
+            self.logger.warning(f"Erreur lecture cache OCR pour {file_path}: {e}")
+            return None
+
+    def put(self, file_path, signature, page_texts):
+        """Enregistre le texte des pages"""
+        try:
+            entry_path = self._entry_path(self.get_key(file_path, signature))
+            page_texts = list(page_texts)
+            if os.path.exists(entry_path):
+                with open(entry_path, 'r', encoding='utf-8') as f:
+                    cached_pages = json.load(f)['pages']
+                # Entrée partielle (OCR adaptatif): la compléter avec les nouvelles pages
+                if None in cached_pages and len(cached_pages) == len(page_texts):
+                    page_texts = [text if text is not None else cached for text, cached in zip(page_texts, cached_pages)]
+                if page_texts == cached_pages or None not in cached_pages:
+                    os.utime(entry_path)
+                    return
+
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            try:
+                replaced_size = os.path.getsize(entry_path)
+            except OSError:
+                replaced_size = 0
+
+            # Écriture atomique (plusieurs workers peuvent écrire en parallèle)
+            tmp_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'signature': signature, 'pages': page_texts}, f, ensure_ascii=False)
+            os.replace(tmp_path, entry_path)
+
+            self.track(os.path.getsize(entry_path) - replaced_size)
+        except Exception as e:
+            self.logger.warning(f"Erreur écriture cache OCR pour {file_path}: {e}")
+
+    def track(self, delta):
+        """
+        Met à jour la taille estimée du cache; l'éviction (parcours complet)
+        n'a lieu qu'au-delà de la taille max ou tous les RESCAN_INTERVAL ajouts
+        """
+        with self._lock:
+            self._puts += 1
+            if self._total_size is not None:
+                self._total_size += delta
+            rescan = (self._total_size is None or self._total_size > self.max_size
+                      or self._puts % self.RESCAN_INTERVAL == 0)
+        if rescan:
+            self.evict()
+
+    def evict(self):
+        """Supprime les entrées les moins récemment utilisées au-delà de la taille max"""
+        with self._lock:
+            entries = []
+            total_size = 0
+            for subdir, _, files in os.walk(self.cache_dir):
+                for file in files:
+                    if not file.endswith('.json'):
+                        continue
+                    path = os.path.join(subdir, file)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+                    total_size += stat.st_size
+
+            self._total_size = total_size
+            if total_size <= self.max_size:
+                return
+
+            evicted = 0
+            for _, size, path in sorted(entries):
+                if total_size <= self.max_size:
+                    break
+                try:
+                    os.remove(path)
+                    total_size -= size
+                    evicted += 1
+                except OSError:
+                    pass
+
+            self._total_size = total_size
+            self.logger.debug(f"Cache OCR: {evicted} entrée(s) supprimée(s)")
@@ -0,0 +1,107 @@
+# src/utils/pipeline.py
+import queue
+import threading
+from src.utils.logger import Logger
+
+
+class Pipeline:
+    """
+    Pipeline à étages reliés par des files bornées
+    Chaque étage a ses propres workers (threads) et bloque quand l'étage suivant
+    est saturé (backpressure)
+    """
+
+    _STOP = object()
+
+    def __init__(self, queue_size=8):
+        self.logger = Logger()
+        self.queue_size = max(1, int(queue_size))
+        self.stages = []
+
+    def add_stage(self, name, function, workers=1, batch_size=1):
+        """
+        Ajoute un étage: function(item, emit) appelle emit(x) pour chaque sortie
+        Avec batch_size > 1, function reçoit la liste des éléments disponibles
+        (jusqu'à batch_size) au lieu d'un seul élément
+        Retourne le pipeline pour chaîner les appels
+        """
+        self.stages.append((name, function, max(1, int(workers)), max(1, int(batch_size))))
+        return self
+
+    def run(self, items):
+        """Injecte les éléments dans le premier étage et retourne les sorties du dernier"""
+        if not self.stages:
+            return list(items)
+
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        results = []
+        results_lock = threading.Lock()
+        threads = []
+
+        for index, (name, function, workers, batch_size) in enumerate(self.stages):
+            input_queue = queues[index]
+            if index + 1 < len(self.stages):
+                emit = queues[index + 1].put
+            else:
+                def emit(item):
+                    with results_lock:
+                        results.append(item)
+
+            # Le dernier worker de l'étage à s'arrêter arrête l'étage suivant
+            state = {'running': workers}
+            state_lock = threading.Lock()
+
+            for worker_index in range(workers):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(index, name, function, batch_size, input_queue, emit, state, state_lock, queues),
+                    name=f"{name}-{worker_index + 1}",
+                    daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+            self.logger.debug(f"Étage '{name}': {workers} worker(s)")
+
+        for item in items:
+            queues[0].put(item)
+        for _ in range(self.stages[0][2]):
+            queues[0].put(self._STOP)
+
+        for thread in threads:
+            thread.join()
+
+        return results
+
+    def _worker(self, index, name, function, batch_size, input_queue, emit, state, state_lock, queues):
+        """Boucle d'un worker: consomme sa file jusqu'au signal d'arrêt"""
+        stopped = False
+        while not stopped:
+            item = input_queue.get()
+            if item is self._STOP:
+                break
+
+            # Regrouper les éléments déjà en attente, sans attendre les suivants
+            batch = [item]
+            while len(batch) < batch_size:
+                try:
+                    item = input_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stopped = True
+                    break
+                batch.append(item)
+
+            try:
+                function(batch if batch_size > 1 else batch[0], emit)
+            except Exception as e:
+                self.logger.error(f"Erreur dans l'étage '{name}': {e}")
+
+        with state_lock:
+            state['running'] -= 1
+            last = state['running'] == 0
+
+        if last and index + 1 < len(self.stages):
+            for _ in range(self.stages[index + 1][2]):
+                queues[index + 1].put(self._STOP)
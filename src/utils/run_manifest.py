@@ -0,0 +1,140 @@
+# src/utils/run_manifest.py
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from src.utils.logger import Logger
+from src.utils.ocr_cache import OCRCache
+
+
+class RunManifest:
+    """
+    Registre des fichiers déjà traités (chemin, taille, date, hash, sortie, statut)
+    Permet de ne traiter que les fichiers nouveaux ou modifiés
+    """
+
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+
+    # Sauvegarde groupée: tous les SAVE_EVERY enregistrements ou SAVE_INTERVAL secondes
+    SAVE_EVERY = 50
+    SAVE_INTERVAL = 30
+
+    def __init__(self, manifest_file='src/config/run_manifest.json'):
+        self.logger = Logger()
+        self.manifest_file = manifest_file
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self._last_save = time.monotonic()
+        self.entries = self.load_manifest()
+
+    def load_manifest(self):
+        """Charge le registre existant"""
+        try:
+            if os.path.exists(self.manifest_file):
+                with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                    return json.load(f).get('files', {})
+        except Exception as e:
+            self.logger.error(f"Erreur chargement manifeste: {e}")
+        return {}
+
+    def save_manifest(self):
+        """Sauvegarde le registre (écriture atomique)"""
+        try:
+            os.makedirs(os.path.dirname(self.manifest_file) or '.', exist_ok=True)
+            tmp_path = f"{self.manifest_file}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'files': self.entries}, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.manifest_file)
+            self._unsaved = 0
+            self._last_save = time.monotonic()
+        except Exception as e:
+            self.logger.error(f"Erreur sauvegarde manifeste: {e}")
+
+    def flush(self):
+        """Sauvegarde les enregistrements pas encore écrits (fin d'exécution)"""
+        with self._lock:
+            if self._unsaved:
+                self.save_manifest()
+
+    @staticmethod
+    def _key(file_path):
+        return os.path.normpath(os.path.abspath(file_path))
+
+    def is_processed(self, file_path):
+        """Vrai si le fichier a déjà été traité avec succès et n'a pas changé"""
+        entry = self.entries.get(self._key(file_path))
+        if not entry or entry.get('status') != self.STATUS_DONE:
+            return False
+
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+
+        if stat.st_size == entry.get('size') and stat.st_mtime == entry.get('mtime'):
+            return True
+
+        # Date modifiée (copie, touch...): comparer le contenu
+        if stat.st_size == entry.get('size') and OCRCache.hash_file(file_path) == entry.get('hash'):
+            with self._lock:
+                entry['mtime'] = stat.st_mtime
+            return True
+
+        return False
+
+    def filter_pending(self, files):
+        """Retourne les fichiers nouveaux ou modifiés"""
+        pending = [file for file in files if not self.is_processed(file)]
+        skipped = len(files) - len(pending)
+        if skipped:
+            self.logger.info(f"{skipped} fichier(s) déjà traité(s) ignoré(s)")
+        return pending
+
+    def record(self, file_path, output_path=None, status=STATUS_DONE, save=True, file_hash=None):
+        """
+        Enregistre le résultat du traitement d'un fichier
+        file_hash: hash déjà calculé par le worker (relu seulement s'il manque)
+        Le registre est sauvegardé par lots (save=False: jamais ici, voir flush)
+        """
+        try:
+            stat = os.stat(file_path)
+            # Le hash ne sert qu'à reconnaître un fichier déjà traité avec succès
+            if file_hash is None and status == self.STATUS_DONE:
+                file_hash = OCRCache.hash_file(file_path)
+        except OSError as e:
+            self.logger.warning(f"Manifeste: fichier illisible {file_path}: {e}")
+            return
+
+        with self._lock:
+            self.entries[self._key(file_path)] = {
+                'path': file_path,
+                'size': stat.st_size,
+                'mtime': stat.st_mtime,
+                'hash': file_hash,
+                'output_path': output_path,
+                'status': status,
+                'processed_at': datetime.now().isoformat()
+            }
+            self._unsaved += 1
+            if save and (self._unsaved >= self.SAVE_EVERY
+                         or time.monotonic() - self._last_save >= self.SAVE_INTERVAL):
+                self.save_manifest()
+
+    def record_result(self, result):
+        """Enregistre un résultat réussi (dict retourné par OCRController)"""
+        self.record(result['pdf_path'], result.get('output_path'), self.STATUS_DONE,
+                    file_hash=result.get('file_hash'))
+
+    def record_failures(self, files, results):
+        """Marque en échec les fichiers du lot sans résultat"""
+        succeeded = {result['pdf_path'] for result in results if result}
+        failed = [file for file in files if file not in succeeded]
+        for file in failed:
+            self.record(file, None, self.STATUS_FAILED, save=False)
+
+        self.flush()
+
+        if failed:
+            self.logger.warning(f"{len(failed)} fichier(s) en échec, retraités au prochain passage")
@@ -0,0 +1,196 @@
+# src/utils/run_metrics.py
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from src.utils.logger import Logger
+
+
+class RunMetrics:
+    """
+    Compteurs de l'exécution (pages OCRisées, pages blanches ignorées...)
+    et histogrammes des durées des étapes (rastérisation, OCR, extraction...)
+    Partagés par les threads du processus; les processus workers renvoient
+    leurs métriques avec chaque résultat (voir ConcurrentManager)
+    """
+
+    _counters = {}
+    _timings = {}
+    _lock = threading.Lock()
+
+    PERCENTILES = (50, 90, 99)
+
+    # Bornes supérieures des classes de durées (secondes), de 0,1 ms à 700 s
+    # Mémoire fixe par étape, quel que soit le nombre de pages
+    BUCKETS = tuple(
+        round(mantissa * 10 ** exponent, 5)
+        for exponent in range(-4, 3) for mantissa in (1, 1.5, 2, 3, 5, 7)
+    )
+
+    @staticmethod
+    def increment(name, value=1):
+        with RunMetrics._lock:
+            RunMetrics._counters[name] = RunMetrics._counters.get(name, 0) + value
+
+    @staticmethod
+    def get(name):
+        with RunMetrics._lock:
+            return RunMetrics._counters.get(name, 0)
+
+    @staticmethod
+    def new_histogram():
+        return {'count': 0, 'total': 0.0, 'min': None, 'max': None, 'buckets': [0] * (len(RunMetrics.BUCKETS) + 1)}
+
+    @staticmethod
+    def observe(name, seconds):
+        """Ajoute la durée d'une étape à son histogramme"""
+        index = bisect.bisect_left(RunMetrics.BUCKETS, seconds)
+        with RunMetrics._lock:
+            histogram = RunMetrics._timings.get(name)
+            if histogram is None:
+                histogram = RunMetrics._timings[name] = RunMetrics.new_histogram()
+            histogram['count'] += 1
+            histogram['total'] += seconds
+            histogram['min'] = seconds if histogram['min'] is None else min(histogram['min'], seconds)
+            histogram['max'] = seconds if histogram['max'] is None else max(histogram['max'], seconds)
+            histogram['buckets'][index] += 1
+
+    @staticmethod
+    @contextmanager
+    def timer(name):
+        """Mesure la durée du bloc: with RunMetrics.timer('ocr'): ..."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            RunMetrics.observe(name, time.perf_counter() - start)
+
+    @staticmethod
+    def snapshot():
+        """Copie des compteurs"""
+        with RunMetrics._lock:
+            return dict(RunMetrics._counters)
+
+    @staticmethod
+    def drain():
+        """Retourne les métriques (compteurs, durées) et les remet à zéro (côté worker)"""
+        with RunMetrics._lock:
+            metrics = {'counters': RunMetrics._counters, 'timings': RunMetrics._timings}
+            RunMetrics._counters = {}
+            RunMetrics._timings = {}
+            return metrics
+
+    @staticmethod
+    def merge(metrics):
+        """Ajoute les métriques reçues d'un worker (voir drain)"""
+        if not metrics:
+            return
+        with RunMetrics._lock:
+            for name, value in metrics.get('counters', {}).items():
+                RunMetrics._counters[name] = RunMetrics._counters.get(name, 0) + value
+            for name, other in metrics.get('timings', {}).items():
+                histogram = RunMetrics._timings.get(name)
+                if histogram is None:
+                    histogram = RunMetrics._timings[name] = RunMetrics.new_histogram()
+                histogram['count'] += other['count']
+                histogram['total'] += other['total']
+                for bound in ('min', 'max'):
+                    values = [value for value in (histogram[bound], other[bound]) if value is not None]
+                    histogram[bound] = (min if bound == 'min' else max)(values) if values else None
+                histogram['buckets'] = [a + b for a, b in zip(histogram['buckets'], other['buckets'])]
+
+    @staticmethod
+    def reset():
+        with RunMetrics._lock:
+            RunMetrics._counters = {}
+            RunMetrics._timings = {}
+
+    @staticmethod
+    def percentile(histogram, percent):
+        """
+        Percentile estimé par interpolation dans la classe qui contient le rang,
+        ramené entre le minimum et le maximum observés
+        """
+        if not histogram['count']:
+            return None
+        rank = max(1, -(-histogram['count'] * percent // 100))
+        seen = 0
+        for index, count in enumerate(histogram['buckets']):
+            if count and seen + count >= rank:
+                lower = max(histogram['min'], RunMetrics.BUCKETS[index - 1] if index else 0)
+                upper = min(histogram['max'], RunMetrics.BUCKETS[index] if index < len(RunMetrics.BUCKETS) else histogram['max'])
+                return lower + (upper - lower) * (rank - seen) / count
+            seen += count
+        return histogram['max']
+
+    @staticmethod
+    def summarize_timings():
+        """
+        Par étape: nombre, total, moyenne, minimum, percentiles, maximum (secondes)
+        et classes non vides de l'histogramme: [borne supérieure, nombre]
+        """
+        with RunMetrics._lock:
+            timings = {name: dict(histogram) for name, histogram in RunMetrics._timings.items()}
+
+        summary = {}
+        for name, histogram in timings.items():
+            if not histogram['count']:
+                continue
+            stats = {
+                'count': histogram['count'],
+                'total': histogram['total'],
+                'mean': histogram['total'] / histogram['count'],
+                'min': histogram['min']
+            }
+            for percent in RunMetrics.PERCENTILES:
+                stats[f'p{percent}'] = RunMetrics.percentile(histogram, percent)
+            stats['max'] = histogram['max']
+            bounds = RunMetrics.BUCKETS + (None,)
+            stats['histogram'] = [
+                [bound, count] for bound, count in zip(bounds, histogram['buckets']) if count
+            ]
+            summary[name] = stats
+        return summary
+
+    @staticmethod
+    def get_metrics_file(settings=None):
+        """
+        Fichier des métriques de l'exécution (section metrics de config.json)
+        Horodaté comme le fichier de log; None si désactivé
+        """
+        settings = settings or {}
+        if not settings.get('enabled', True):
+            return None
+        folder = settings.get('folder', 'logs')
+        return os.path.join(folder, f"metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+
+    @staticmethod
+    def export(metrics_file, extra=None):
+        """Écrit les métriques de l'exécution en JSON (extra: champs ajoutés tels quels)"""
+        data = dict(extra or {})
+        data['counters'] = RunMetrics.snapshot()
+        data['timings'] = RunMetrics.summarize_timings()
+        try:
+            os.makedirs(os.path.dirname(metrics_file) or '.', exist_ok=True)
+            with open(metrics_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+        except Exception as e:
+            Logger().error(f"Erreur écriture des métriques: {e}")
+
+    @staticmethod
+    def report():
+        """Journalise les compteurs et les durées médianes de l'exécution"""
+        counters = RunMetrics.snapshot()
+        timings = RunMetrics.summarize_timings()
+        if not counters and not timings:
+            return
+        logger = Logger()
+        logger.info("Métriques de l'exécution:")
+        for name in sorted(counters):
+            logger.info(f"  {name}: {counters[name]}")
+        for name in sorted(timings):
+            stats = timings[name]
+            logger.info(f"  {name}: {stats['count']} × {stats['p50'] * 1000:.0f} ms (p50), p99 {stats['p99'] * 1000:.0f} ms")
@@ -0,0 +1,214 @@
+# src/utils/thread_tuner.py
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from src.utils.logger import Logger
+
+
+def _init_tuner_worker(omp_threads, config=None):
+    """Processus de mesure: limite OpenMP fixée avant le chargement de Tesseract"""
+    ThreadTuner.apply(omp_threads)
+    from src.controllers.ocr_controller import OCRController
+    OCRController.configure(config)
+
+
+def _recognize(page, options):
+    """OCR d'une page avec le moteur configuré (ocr_engine.backend)"""
+    from src.controllers.ocr_controller import OCRController
+    return OCRController.get_engine().recognize(page, options)
+
+
+def _engine_version():
+    from src.controllers.ocr_controller import OCRController
+    engine = OCRController.get_engine()
+    return f"{engine.name} {engine.get_version()}"
+
+
+class ThreadTuner:
+    """
+    Coordonne le nombre de workers avec les threads OpenMP de Tesseract
+    (OMP_THREAD_LIMIT) pour que workers × threads ne dépasse pas le nombre de cœurs
+    Le mode autotune mesure les pages/s de chaque répartition au démarrage
+    """
+
+    logger = Logger()
+
+    ENV_VAR = 'OMP_THREAD_LIMIT'
+
+    @staticmethod
+    def get_cpu_count():
+        """Nombre de cœurs utilisables par le processus"""
+        try:
+            return len(os.sched_getaffinity(0)) or 1
+        except AttributeError:
+            return os.cpu_count() or 1
+
+    @staticmethod
+    def get_omp_thread_limit():
+        """Limite de threads OpenMP en vigueur (1 si non définie)"""
+        try:
+            return max(1, int(os.environ.get(ThreadTuner.ENV_VAR, 1)))
+        except ValueError:
+            return 1
+
+    @staticmethod
+    def apply(omp_threads):
+        """
+        Fixe la limite pour les processus tesseract lancés ensuite (et les workers)
+        tesserocr la lit au chargement de libtesseract: appeler avant le premier OCR
+        """
+        os.environ[ThreadTuner.ENV_VAR] = str(max(1, int(omp_threads)))
+
+    @staticmethod
+    def plan(max_workers=None, omp_threads=None):
+        """
+        Répartition (workers, threads OpenMP) pour les cœurs disponibles
+        La valeur non fixée est déduite de l'autre
+        """
+        cores = ThreadTuner.get_cpu_count()
+        if omp_threads:
+            omp_threads = max(1, int(omp_threads))
+            workers = int(max_workers) if max_workers else max(1, cores // omp_threads)
+        elif max_workers:
+            workers = max(1, int(max_workers))
+            omp_threads = max(1, cores // workers)
+        else:
+            # Défaut: un thread OpenMP par worker, un worker par cœur
+            workers, omp_threads = cores, 1
+        return workers, omp_threads
+
+    @staticmethod
+    def candidates():
+        """Répartitions à mesurer: threads OpenMP en puissances de 2"""
+        cores = ThreadTuner.get_cpu_count()
+        splits = []
+        omp_threads = 1
+        while omp_threads <= cores:
+            splits.append((max(1, cores // omp_threads), omp_threads))
+            omp_threads *= 2
+        return splits
+
+    @staticmethod
+    def setup(config, sample_pdf=None):
+        """
+        Détermine et applique la répartition selon la section concurrency
+        Retourne la config avec max_workers et omp_thread_limit résolus
+        """
+        concurrency = dict(config.get('concurrency', {}))
+        max_workers = concurrency.get('max_workers')
+        omp_threads = concurrency.get('omp_thread_limit')
+
+        # Limite imposée par l'environnement, sauf réglage explicite
+        if not omp_threads and ThreadTuner.ENV_VAR in os.environ:
+            omp_threads = ThreadTuner.get_omp_thread_limit()
+
+        if concurrency.get('autotune') and not (max_workers or omp_threads):
+            tuned = ThreadTuner.autotune(
+                sample_pdf, concurrency.get('autotune_file', 'src/config/autotune.json'), config=config
+            )
+            if tuned:
+                max_workers, omp_threads = tuned
+
+        workers, omp_threads = ThreadTuner.plan(max_workers, omp_threads)
+        ThreadTuner.apply(omp_threads)
+        ThreadTuner.logger.info(
+            f"Répartition CPU: {workers} worker(s) × {omp_threads} thread(s) OpenMP "
+            f"({ThreadTuner.get_cpu_count()} cœur(s))"
+        )
+
+        concurrency['max_workers'] = workers
+        concurrency['omp_thread_limit'] = omp_threads
+        return dict(config, concurrency=concurrency)
+
+    @staticmethod
+    def autotune(sample_pdf, autotune_file='src/config/autotune.json', rounds=2, config=None):
+        """
+        Mesure les pages/s de chaque répartition sur la première page d'un PDF,
+        avec le moteur OCR configuré (tesserocr ou pytesseract)
+        Chaque répartition tourne dans des processus neufs: la limite OpenMP
+        n'est lue qu'au chargement de libtesseract, une fois par processus
+        Résultat mémorisé par machine (cœurs + moteur et version de Tesseract)
+        Retourne (workers, threads OpenMP) ou None
+        """
+        from src.controllers.ocr_controller import OCRController
+
+        # Le processus principal ne charge pas Tesseract avant la répartition finale
+        context = multiprocessing.get_context('spawn')
+
+        def create_pool(workers, omp_threads):
+            return ProcessPoolExecutor(
+                max_workers=workers, mp_context=context,
+                initializer=_init_tuner_worker, initargs=(omp_threads, config)
+            )
+
+        try:
+            with create_pool(1, 1) as executor:
+                machine_key = f"{ThreadTuner.get_cpu_count()}:{executor.submit(_engine_version).result()}"
+        except Exception as e:
+            ThreadTuner.logger.warning(f"Autotune impossible, Tesseract indisponible: {e}")
+            return None
+
+        results = ThreadTuner.load_results(autotune_file)
+        if machine_key in results:
+            workers, omp_threads = results[machine_key]
+            ThreadTuner.logger.info(f"Autotune: répartition mémorisée {workers} × {omp_threads}")
+            return workers, omp_threads
+
+        if not sample_pdf:
+            ThreadTuner.logger.warning("Autotune: aucun PDF disponible pour la mesure")
+            return None
+
+        pages = OCRController.rasterize_pages(sample_pdf, first_page=1, last_page=1)
+        if not pages:
+            return None
+
+        page = pages[0]
+        options = OCRController.get_ocr_options(sample_pdf)
+        best = None
+        try:
+            for workers, omp_threads in ThreadTuner.candidates():
+                with create_pool(workers, omp_threads) as executor:
+                    # Démarrage des processus et chargement du modèle hors mesure
+                    list(executor.map(_recognize, [page] * workers, [options] * workers))
+                    count = workers * rounds
+                    start = time.perf_counter()
+                    list(executor.map(_recognize, [page] * count, [options] * count))
+                    pages_per_second = count / (time.perf_counter() - start)
+                ThreadTuner.logger.info(
+                    f"Autotune: {workers} worker(s) × {omp_threads} thread(s): {pages_per_second:.2f} pages/s"
+                )
+                if best is None or pages_per_second > best[0]:
+                    best = (pages_per_second, workers, omp_threads)
+        except Exception as e:
+            ThreadTuner.logger.warning(f"Autotune interrompu: {e}")
+        finally:
+            OCRController.release_page(page)
+
+        if best is None:
+            return None
+
+        _, workers, omp_threads = best
+        results[machine_key] = [workers, omp_threads]
+        ThreadTuner.save_results(autotune_file, results)
+        return workers, omp_threads
+
+    @staticmethod
+    def load_results(autotune_file):
+        try:
+            if os.path.exists(autotune_file):
+                with open(autotune_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            ThreadTuner.logger.warning(f"Erreur lecture autotune: {e}")
+        return {}
+
+    @staticmethod
+    def save_results(autotune_file, results):
+        try:
+            os.makedirs(os.path.dirname(autotune_file) or '.', exist_ok=True)
+            with open(autotune_file, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+        except Exception as e:
+            ThreadTuner.logger.warning(f"Erreur sauvegarde autotune: {e}")